@@ -0,0 +1,349 @@
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+import tournament_scheduler as ts
+
+VALID_SETS = ["6:0", "6:1", "6:2", "6:3", "6:4", "7:5", "7:6"]
+
+def make_players(n):
+    return [f"Spieler{i}" for i in range(n)]
+
+def players_for_matches(matches):
+    # Kleinste Spieleranzahl, deren Round-Robin mindestens so viele Matches hat
+    n = 2
+    while n * (n - 1) // 2 < matches:
+        n += 1
+    return n
+
+def random_score(rng):
+    winner_first = rng.random() < 0.5
+    sets = [rng.choice(VALID_SETS) for _ in range(2)]
+    if rng.random() < 0.3:
+        sets.insert(rng.randrange(2), ":".join(reversed(rng.choice(VALID_SETS).split(":"))))
+    if not winner_first:
+        sets = [":".join(reversed(s.split(":"))) for s in sets]
+    return ", ".join(sets)
+
+def setup_tournament(n, played_ratio=0.5, seed=42):
+    rng = random.Random(seed)
+    ts.players.clear()
+    ts.players.extend(make_players(n))
+    ts.match_results.clear()
+    pairs = ts.generate_round_robin_pairs(ts.players)
+    ts.organize_match_days(pairs, ts.players)
+    for p1, p2 in pairs:
+        if rng.random() < played_ratio:
+            ts.record_result(p1, p2, random_score(rng))
+    return pairs
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def timed_with_memory(func, *args, **kwargs):
+    tracemalloc.start()
+    try:
+        elapsed, result = timed(func, *args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak, result
+
+def bench_scheduling(sizes=(10, 50, 100, 200, 400)):
+    print("=== Spielplan-Erstellung: Greedy vs. Kreismethode ===")
+    print(f"{'Spieler':>8} | {'Matches':>8} | {'Greedy (s)':>11} | {'Tage':>5} | {'Kreis (s)':>10} | {'Tage':>5}")
+    for n in sizes:
+        players = make_players(n)
+        pairs = ts.generate_round_robin_pairs(players)
+        greedy_time, greedy = timed(ts.organize_match_days, pairs, players, method="greedy")
+        circle_time, circle = timed(ts.organize_match_days, pairs, players, method="circle")
+        print(f"{n:>8} | {len(pairs):>8} | {greedy_time:>11.4f} | {len(greedy):>5} | {circle_time:>10.4f} | {len(circle):>5}")
+
+def bench_constraints(sizes=(100, 500, 700), courts=50):
+    print(f"\n=== Planung mit {courts} Plätzen und gesperrten Tagen ===")
+    print(f"{'Spieler':>8} | {'Matches':>8} | {'Zeit (s)':>9} | {'Tage':>5} | {'Nicht planbar':>13}")
+    for n in sizes:
+        players = make_players(n)
+        pairs = ts.generate_round_robin_pairs(players)
+        # Jeder dritte Spieler ist an zwei Tagen verhindert
+        unavailable = {p: {i % 50 + 1, i % 7 + 3} for i, p in enumerate(players[::3])}
+        elapsed, result = timed(ts.organize_constrained_match_days, pairs, players, courts, unavailable)
+        print(f"{n:>8} | {len(pairs):>8} | {elapsed:>9.3f} | {len(ts.match_days):>5} | {len(result.details):>13}")
+
+def bench_save(match_counts=(1_000, 10_000, 100_000)):
+    print("\n=== Speichern (save_tournament) ===")
+    print(f"{'Matches':>8} | {'Zeit (s)':>9} | {'Peak (MB)':>10} | {'Datei (MB)':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "turnier.json")
+        for matches in match_counts:
+            setup_tournament(players_for_matches(matches))
+            elapsed, result = timed(ts.save_tournament, filename)
+            assert result.success, result.message
+            peak = timed_with_memory(ts.save_tournament, filename)[1]
+            total = sum(len(day["matches"]) for day in ts.match_days.values())
+            size = os.path.getsize(filename)
+            print(f"{total:>8} | {elapsed:>9.3f} | {peak / 2**20:>10.2f} | {size / 2**20:>11.2f}")
+
+def bench_load(match_counts=(10_000, 100_000)):
+    print("\n=== Laden: load_tournament vs. load_tournament_streaming ===")
+    print(f"{'Matches':>8} | {'json (s)':>9} | {'Peak (MB)':>10} | {'Stream (s)':>11} | {'Peak (MB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "turnier.json")
+        for matches in match_counts:
+            setup_tournament(players_for_matches(matches))
+            ts.save_tournament(filename)
+            row = []
+            for loader in (ts.load_tournament, ts.load_tournament_streaming):
+                elapsed, result = timed(loader, filename)
+                assert result.success, result.message
+                ts.match_results.clear()
+                ts.match_days.clear()
+                peak = timed_with_memory(loader, filename)[1]
+                row.extend([elapsed, peak / 2**20])
+            total = sum(len(day["matches"]) for day in ts.match_days.values())
+            print(f"{total:>8} | {row[0]:>9.3f} | {row[1]:>10.2f} | {row[2]:>11.3f} | {row[3]:>10.2f}")
+
+def bench_snapshot(match_counts=(10_000, 100_000)):
+    print("\n=== JSON vs. binärer Snapshot ===")
+    print(f"{'Matches':>8} | {'JSON (MB)':>9} | {'Bin (MB)':>8} | {'JSON speichern':>14} | {'Bin speichern':>13} | "
+          f"{'JSON laden':>10} | {'Bin öffnen':>10} | {'Bin laden':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = os.path.join(tmp, "turnier.json")
+        binary_file = os.path.join(tmp, "turnier.snap")
+        for matches in match_counts:
+            setup_tournament(players_for_matches(matches))
+            total = sum(len(day["matches"]) for day in ts.match_days.values())
+            json_save = timed(ts.save_tournament, json_file)[0]
+            binary_save = timed(ts.save_binary_snapshot, binary_file)[0]
+            json_load = timed(ts.load_tournament, json_file)[0]
+            ts.close_binary_snapshots()
+            binary_open = timed(ts.open_binary_snapshot, binary_file)[0]
+            binary_load = timed(ts.load_binary_snapshot, binary_file)[0]
+            ts.close_binary_snapshots()
+            print(f"{total:>8} | {os.path.getsize(json_file) / 2**20:>9.2f} | {os.path.getsize(binary_file) / 2**20:>8.2f} | "
+                  f"{json_save:>14.3f} | {binary_save:>13.3f} | {json_load:>10.3f} | {binary_open:>10.5f} | {binary_load:>9.3f}")
+
+def bench_statistics(match_counts=(10_000, 100_000)):
+    print("\n=== Statistik-Neuberechnung aller Spieler ===")
+    print(f"{'Matches':>8} | {'Python (s)':>10} | {'NumPy (s)':>9} | {'Batch-Abruf (s)':>15}")
+    numpy_module = ts.numpy
+    for matches in match_counts:
+        setup_tournament(players_for_matches(matches))
+        ts.numpy = None
+        python_time = timed(ts.recompute_player_statistics)[0]
+        ts.numpy = numpy_module
+        numpy_time = timed(ts.recompute_player_statistics)[0] if numpy_module else float("nan")
+        batch_time = timed(ts.get_all_player_statistics, ts.players)[0]
+        print(f"{len(ts.match_results):>8} | {python_time:>10.4f} | {numpy_time:>9.4f} | {batch_time:>15.5f}")
+
+def setup_all_tied(n):
+    # Ungerade Spielerzahl, jeder schlägt die nächsten (n-1)/2 Spieler: alle punktgleich
+    ts.players.clear()
+    ts.players.extend(make_players(n))
+    ts.match_results.clear()
+    pairs = ts.generate_round_robin_pairs(ts.players)
+    ts.organize_match_days(pairs, ts.players)
+    rng = random.Random(n)
+    for i, p1 in enumerate(ts.players):
+        for k in range(1, (n - 1) // 2 + 1):
+            p2 = ts.players[(i + k) % n]
+            score = random_score(rng)
+            if ts.parse_score(score).winner != 1:
+                score = ", ".join(":".join(reversed(s.split(":"))) for s in score.split(", "))
+            ts.record_result(p1, p2, score)
+
+def legacy_standings(players):
+    # Bisheriges Verfahren: Tabelle aus den Spielerstatistiken, danach Bubble-Sort mit
+    # direktem Vergleich je Nachbarpaar innerhalb jeder punktgleichen Gruppe
+    player_order = {p: i for i, p in enumerate(players)}
+    standings = [{"player": player, "points": stats["wins"], "sets_won": stats["sets_won"],
+                  "sets_lost": stats["sets_lost"], "games_won": stats["games_won"],
+                  "games_lost": stats["games_lost"]}
+                 for player, stats in ts.get_all_player_statistics(players).items()]
+    standings.sort(key=lambda x: (x["points"], x["sets_won"], x["games_won"]), reverse=True)
+
+    def get_direct_winner(p1, p2):
+        parsed = ts.get_parsed_result(p1, p2)
+        if parsed:
+            return p1 if parsed.winner == 1 else p2
+        return None
+
+    i = 0
+    while i < len(standings):
+        start = i
+        while i < len(standings) - 1 and standings[i]["points"] == standings[i + 1]["points"]:
+            i += 1
+        i += 1
+        if i - start > 1:
+            group = standings[start:i]
+            for j in range(len(group) - 1):
+                for k in range(len(group) - 1 - j):
+                    if get_direct_winner(group[k]["player"], group[k + 1]["player"]) == group[k + 1]["player"]:
+                        group[k], group[k + 1] = group[k + 1], group[k]
+            standings[start:i] = group
+            if all(get_direct_winner(group[j]["player"], group[j + 1]["player"]) is None
+                   for j in range(len(group) - 1)):
+                def sort_key(entry):
+                    set_ratio = entry["sets_won"] / max(1, entry["sets_won"] + entry["sets_lost"])
+                    game_ratio = entry["games_won"] / max(1, entry["games_won"] + entry["games_lost"])
+                    return (entry["points"], set_ratio, game_ratio, -player_order[entry["player"]])
+                standings[start:i] = sorted(standings[start:i], key=sort_key, reverse=True)
+    return standings
+
+def bench_tiebreaks(sizes=(51, 101, 201)):
+    print("\n=== Tabelle mit großen punktgleichen Gruppen ===")
+    print(f"{'Spieler':>8} | {'Bubble (s)':>10} | {'Mini-Tabelle (s)':>16}")
+    for n in sizes:
+        setup_all_tied(n)
+        legacy_time = timed(legacy_standings, ts.players)[0]
+        new_time = timed(ts.calculate_standings, ts.players)[0]
+        print(f"{n:>8} | {legacy_time:>10.4f} | {new_time:>16.4f}")
+
+SUITE_SIZES = (10, 100, 1_000, 5_000)
+# Obergrenze für die Matches je Turnier; bei mehr Spielern nur die ersten Runden
+# der Kreismethode, sonst bräuchte das Round-Robin mit 5.000 Spielern 12,5 Mio. Matches
+SUITE_MAX_MATCHES = 200_000
+SUITE_MATRIX_PLAYERS = 1_000
+SUITE_PERFORMANCE_PLAYERS = 10
+BASELINE_FILE = "benchmark_baseline.json"
+
+def synthetic_pairs(players, max_matches=SUITE_MAX_MATCHES):
+    pairs = ts.generate_round_robin_pairs(players)
+    if len(pairs) <= max_matches:
+        return pairs
+    rounds = ts.generate_berger_rounds(players)
+    per_round = len(rounds[0])
+    return [pair for round_games in rounds[:max(1, max_matches // per_round)] for pair in round_games]
+
+def measure(func, memory=True):
+    # Zeit ohne tracemalloc, Spitzenspeicher in einem zweiten Lauf mit tracemalloc
+    elapsed, result = timed(func)
+    peak = timed_with_memory(func)[1] if memory else None
+    return elapsed, peak, result
+
+def run_suite(sizes=SUITE_SIZES, seed=42, played_ratio=0.5, max_matches=SUITE_MAX_MATCHES, memory=True):
+    # Misst die Kernoperationen auf synthetischen Turnieren mit gesetztem Zufallsgenerator.
+    # Liefert ein JSON-fähiges Dict mit einer Zeile je (Spielerzahl, Operation).
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "turnier.json")
+        for n in sizes:
+            t = ts.Tournament(f"Benchmark {n}")
+            t.players.extend(make_players(n))
+            pairs = synthetic_pairs(t.players, max_matches)
+            rng = random.Random(seed + n)
+            scores = [(p1, p2, random_score(rng)) for p1, p2 in pairs if rng.random() < played_ratio]
+            matrix_players = t.players[:SUITE_MATRIX_PLAYERS]
+            sample = t.players[:SUITE_PERFORMANCE_PLAYERS]
+
+            def record_results():
+                t.match_results.clear()  # der Speicherlauf trägt dieselben Ergebnisse erneut ein
+                for p1, p2, score in scores:
+                    t.record_result(p1, p2, score)
+
+            def ranking_timeline():
+                t.ranking_timeline = None  # kompletter Neuaufbau des Tabellenverlaufs
+                return t.build_ranking_timeline()
+
+            def player_performance():
+                # Verlauf liegt bereits vor (ranking_timeline läuft vorher) und wird nur fortgeschrieben
+                return [t.create_player_performance(p) for p in sample]
+
+            def match_matrix():
+                window = ts.SparseMatchMatrix(matrix_players, t).window(0, len(matrix_players), 0, len(matrix_players))
+                return ts.make_match_matrix_pretty(window)
+
+            operations = [
+                ("organize_match_days", lambda: t.organize_match_days(pairs, t.players)),
+                ("record_result", record_results),
+                ("calculate_standings", lambda: t.calculate_standings(t.players)),
+                ("build_ranking_timeline", ranking_timeline),
+                ("create_player_performance", player_performance),
+                ("save_tournament", lambda: t.save_tournament(filename)),
+                ("load_tournament", lambda: t.load_tournament(filename)),
+                ("make_match_matrix_pretty", match_matrix),
+            ]
+            for name, func in operations:
+                elapsed, peak, _ = measure(func, memory)
+                rows.append({"players": n, "matches": len(pairs), "results": len(scores), "operation": name,
+                             "seconds": round(elapsed, 6), "peak_mb": None if peak is None else round(peak / 2**20, 3)})
+            t.close()
+    return {"seed": seed, "played_ratio": played_ratio, "max_matches": max_matches,
+            "python": platform.python_version(), "numpy": ts.numpy is not None, "rows": rows}
+
+def compare_with_baseline(report, baseline, tolerance=0.25, min_seconds=0.005, min_mb=0.5):
+    # Markiert Operationen, die mehr als tolerance langsamer oder speicherhungriger als die
+    # Baseline sind; sehr kleine absolute Unterschiede gelten als Messrauschen
+    previous = {(row["players"], row["operation"]): row for row in baseline["rows"]}
+    regressions = []
+    for row in report["rows"]:
+        base = previous.get((row["players"], row["operation"]))
+        row["baseline_seconds"] = base["seconds"] if base else None
+        row["regression"] = []
+        if base is None:
+            continue
+        if row["seconds"] > base["seconds"] * (1 + tolerance) and row["seconds"] - base["seconds"] > min_seconds:
+            row["regression"].append("seconds")
+        if (row["peak_mb"] is not None and base.get("peak_mb") is not None
+                and row["peak_mb"] > base["peak_mb"] * (1 + tolerance) and row["peak_mb"] - base["peak_mb"] > min_mb):
+            row["regression"].append("peak_mb")
+        if row["regression"]:
+            regressions.append(row)
+    return regressions
+
+def print_suite(report):
+    print("=== Benchmark-Suite ===")
+    print(f"{'Spieler':>8} | {'Matches':>8} | {'Operation':<26} | {'Zeit (s)':>9} | {'Baseline':>9} | {'Peak (MB)':>10} | Regression")
+    for row in report["rows"]:
+        baseline = row.get("baseline_seconds")
+        peak = row["peak_mb"]
+        print(f"{row['players']:>8} | {row['matches']:>8} | {row['operation']:<26} | {row['seconds']:>9.4f} | "
+              f"{'-' if baseline is None else f'{baseline:.4f}':>9} | {'-' if peak is None else f'{peak:.2f}':>10} | "
+              f"{', '.join(row.get('regression', [])) or '-'}")
+
+def suite_main(args):
+    report = run_suite(args.sizes, args.seed, max_matches=args.max_matches, memory=not args.no_memory)
+    regressions = []
+    if args.baseline and os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_with_baseline(report, json.load(f), args.tolerance)
+    report["regressions"] = len(regressions)
+    print_suite(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline gespeichert: {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} Regression(en) gegenüber {args.baseline}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks für tournament_scheduler")
+    parser.add_argument("--suite", action="store_true", help="Benchmark-Suite mit JSON-Ausgabe und Baseline-Vergleich")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SUITE_SIZES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-matches", type=int, default=SUITE_MAX_MATCHES)
+    parser.add_argument("--no-memory", action="store_true", help="ohne zweiten Lauf mit tracemalloc")
+    parser.add_argument("--output", help="Ergebnis als JSON schreiben")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Ergebnis als neue Baseline speichern")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    if args.suite:
+        raise SystemExit(suite_main(args))
+    bench_scheduling()
+    bench_constraints()
+    bench_save()
+    bench_load()
+    bench_snapshot()
+    bench_statistics()
+    bench_tiebreaks()
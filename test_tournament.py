@@ -2,6 +2,8 @@ import pytest
 from unittest.mock import mock_open, patch
 import json
 import csv
+import os
+import tournament_scheduler
 from tournament_scheduler import *
 
 @pytest.fixture
@@ -82,6 +84,11 @@ def test_export_results_csv(reset_globals):
         assert written_data == expected_data, f"Erwartet: {repr(expected_data)}, erhalten: {repr(written_data)}"
 
 
+def simulate_crash():
+    # Absturz: das Journal wird ohne sync und Kompaktierung verlassen, nur die Datei freigegeben
+    default_tournament.journal.file.close()
+    default_tournament.journal = None
+
 def setup_reset_globals():
     global match_results, current_schedule, match_days
     match_results.clear()
@@ -175,6 +182,147 @@ def test_matrix_with_results():
     a[4][3] = "2:6,1:6"
     assert a == matrix
 
+def test_sparse_matrix_window_matches_full_matrix():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa", "Eva"]
+    create_schedule(generate_round_robin_pairs(players), players)
+    record_result("Anna", "Max", "6:3, 6:4")
+    record_result("Lisa", "Tom", "7:6, 2:6, 6:1")
+    sparse = SparseMatchMatrix(players)
+    assert dict(sparse.items()) == {(0, 1): "6:3,6:4", (1, 0): "3:6,4:6",
+                                    (3, 2): "7:6,2:6,6:1", (2, 3): "6:7,6:2,1:6"}
+    full = create_match_matrix(players)
+    window = sparse.window(2, 2, 1, 3)
+    assert window == [[""] + full[0][2:5]] + [[row[0]] + row[2:5] for row in full[3:5]]
+
+def test_render_matrix_window_widths_from_window_only():
+    setup_reset_globals()
+    players = ["A", "B", "Ein_sehr_langer_Name"]
+    create_schedule(generate_round_robin_pairs(players), players)
+    text = render_match_matrix_window(players, 0, 0, row_count=2, col_count=2)
+    assert "Ein_sehr_langer_Name" not in text
+    assert text.splitlines()[0] == "+----------+----------+----------+"
+    pages = list(iter_match_matrix_pages(players, row_count=2, col_count=2))
+    assert [origin for origin, _ in pages] == [(0, 0), (0, 2), (2, 0), (2, 2)]
+
+def test_import_results_csv_all_or_nothing(tmp_path):
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa"]
+    create_schedule(generate_round_robin_pairs(players), players)
+    bad = tmp_path / "bad.csv"
+    bad.write_text("p1,p2,result\nAnna,Max,6:3, 6:4\nAnna,Max,\"6:3, 6:4\"\nTom,Lisa,6:5\nAnna,Paul,6:0\n",
+                   encoding="utf-8")
+    result = import_results_csv(str(bad))
+    assert not result.success
+    assert [line for line, _ in result.details] == [2, 4, 5]
+    assert len(match_results) == 0
+
+    good = tmp_path / "good.csv"
+    good.write_text("p1,p2,result\nAnna,Max,\"6:3, 6:4\"\nLisa,Tom,\"4:6, 6:2, 7:5\"\n", encoding="utf-8")
+    result = import_results_csv(str(good))
+    assert result.success and result.details == []
+    assert get_match_result("Max", "Anna") == "6:3, 6:4"
+    assert get_player_statistics("Lisa")["wins"] == 1
+
+def test_import_results_csv_roundtrip_with_export(tmp_path):
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom"]
+    create_schedule(generate_round_robin_pairs(players), players)
+    record_result("Anna", "Max", "6:3, 6:4")
+    record_result("Tom", "Anna", "7:6, 6:7, 6:2")
+    path = str(tmp_path / "results.csv")
+    export_results_csv(path)
+    exported = dict(match_results)
+    setup_reset_globals()
+    create_schedule(generate_round_robin_pairs(players), players)
+    assert import_results_csv(path).success
+    assert dict(match_results) == exported
+    assert not import_results_csv(path).success
+
+def test_score_formats_and_batch_validation():
+    best_of_3 = SCORE_FORMATS["best_of_3"]
+    tiebreak = SCORE_FORMATS["match_tiebreak"]
+    results = validate_scores(["6:4, 6:3", "6:4, 6:5", "6:4, 6:3", "6:4, 3:6"])
+    assert results[0][0].sets == ((6, 4), (6, 3)) and results[0][1] is None
+    assert results[0] is results[2]
+    assert results[1][0] is None and "6:5" in results[1][1]
+    assert "Gewinner" in results[3][1]
+    assert check_score("6:4, 6:3, 6:2")[1] is None
+    assert "kein weiterer Satz" in check_score("6:4, 6:3, 6:2", best_of_3)[1]
+    assert check_score("6:4, 3:6, 10:8", tiebreak)[0].winner == 1
+    assert check_score("6:4, 3:6, 12:14", tiebreak)[0].winner == 2
+    assert check_score("6:4, 3:6, 10:9", tiebreak)[0] is None
+    assert check_score("6:4, 3:6, 6:2", tiebreak)[0] is None
+    assert check_score("7:6, 6:1, 3:6", SCORE_FORMATS["best_of_5"])[1] == "Der Sieger braucht 3 Gewinnsätze."
+
+def test_input_match_result_with_match_tiebreak():
+    setup_reset_globals()
+    players = ["Anna", "Max"]
+    create_schedule(generate_round_robin_pairs(players), players)
+    assert set_score_format("match_tiebreak").success
+    try:
+        with patch('builtins.input', side_effect=["6:4", "3:6", "6:4", "10:7"]):
+            player1, player2, score = input_match_result(tournament_scheduler.current_schedule)
+        record_result(player1, player2, score)
+    finally:
+        set_score_format("standard")
+    assert score == "6:4, 3:6, 10:7"
+    assert get_parsed_result("Anna", "Max").winner == 1
+
+def test_match_tiebreak_counts_as_one_game():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom"]
+    create_schedule(generate_round_robin_pairs(players), players)
+    assert set_score_format("match_tiebreak").success
+    try:
+        record_result("Anna", "Max", "6:4, 4:6, 12:10")
+        record_result("Tom", "Anna", "6:3, 3:6, 8:10")
+    finally:
+        set_score_format("standard")
+    assert parse_score("6:4, 4:6, 12:10").games() == (11, 10)
+    anna = get_player_statistics("Anna")
+    assert (anna["sets_won"], anna["sets_lost"]) == (4, 2)
+    assert (anna["games_won"], anna["games_lost"]) == (11 + 10, 10 + 9)
+    assert (anna["tiebreaks_won"], anna["tiebreaks_lost"]) == (0, 0)
+    assert recompute_player_statistics()["Anna"] == anna
+    if tournament_scheduler.numpy is not None:
+        with patch.object(tournament_scheduler, "numpy", None):
+            assert recompute_player_statistics()["Anna"] == anna
+    timeline = RankingTimeline(players)
+    for (p1, p2), parsed in match_results.parsed.items():
+        timeline.add(p1, p2, parsed)
+    assert timeline.totals["Anna"] == [4, 2, 21, 19]
+
+def test_export_tournament_csv_tables(tmp_path):
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom"]
+    create_schedule(generate_round_robin_pairs(players), players)
+    record_result("Max", "Anna", "6:3, 6:4")
+    result = export_tournament_csv(str(tmp_path))
+    assert result.success
+    assert [os.path.basename(p) for p in result.details] == ["results.csv", "schedule.csv", "standings.csv"]
+    with open(tmp_path / "results.csv", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[1] == ["Max", "Anna", "6:3, 6:4", "Max", "2", "0", "12", "7"]
+    with open(tmp_path / "schedule.csv", encoding="utf-8", newline="") as f:
+        schedule_rows = list(csv.DictReader(f))
+    assert len(schedule_rows) == 3
+    assert sum(row["status"] == "completed" for row in schedule_rows) == 1
+    with open(tmp_path / "standings.csv", encoding="utf-8", newline="") as f:
+        standings_rows = list(csv.DictReader(f))
+    assert standings_rows[0]["player"] == "Max" and standings_rows[0]["rank"] == "1"
+
+def test_export_tournament_csv_gzip(tmp_path):
+    import gzip
+    setup_reset_globals()
+    players = ["Anna", "Max"]
+    create_schedule(generate_round_robin_pairs(players), players)
+    record_result("Anna", "Max", "6:3, 6:4")
+    result = export_tournament_csv(str(tmp_path), compress=True, tables=("results",))
+    assert result.success
+    with gzip.open(tmp_path / "results.csv.gz", "rt", encoding="utf-8", newline="") as f:
+        assert list(csv.reader(f))[1][:3] == ["Anna", "Max", "6:3, 6:4"]
+
 def test_player_statistics():
     setup_reset_globals()
     players = ["Anna", "Max"]
@@ -364,4 +512,850 @@ def test_player_statistics_counts_wins_and_losses_correctly():
     assert anna_stats["wins"] == 0
     assert anna_stats["losses"] == 1
     assert max_stats["wins"] == 1
-    assert max_stats["losses"] == 0
\ No newline at end of file
+    assert max_stats["losses"] == 0
+
+def test_organize_match_days_circle_even():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa", "Paul", "Eva"]
+    pairs = generate_round_robin_pairs(players)
+    organize_match_days(pairs, players, method="circle")
+    assert len(match_days) == 5
+    for day in match_days.values():
+        assert len(day["matches"]) == 3
+        assert len({p for m in day["matches"] for p in m}) == 6
+    scheduled = [m for day in match_days.values() for m in day["matches"]]
+    assert sorted(scheduled) == sorted(pairs)
+
+def test_organize_match_days_circle_odd():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa", "Paul"]
+    pairs = generate_round_robin_pairs(players)
+    organize_match_days(pairs, players, method="circle")
+    assert len(match_days) == 5
+    assert all(len(day["matches"]) == 2 for day in match_days.values())
+    byes = [set(players) - {p for m in day["matches"] for p in m} for day in match_days.values()]
+    assert sorted(p for bye in byes for p in bye) == sorted(players)
+
+def test_organize_match_days_falls_back_to_greedy():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa"]
+    pairs = [("Anna", "Max"), ("Tom", "Lisa"), ("Anna", "Tom")]
+    organize_match_days(pairs, players)
+    assert match_days[1]["matches"] == [("Anna", "Max"), ("Tom", "Lisa")]
+    assert match_days[2]["matches"] == [("Anna", "Tom")]
+    with pytest.raises(ValueError):
+        organize_match_days(pairs, players, method="circle")
+
+def test_player_statistics_follow_result_changes():
+    setup_reset_globals()
+    match_results[("Anna", "Max")] = "7:6, 3:6, 6:4"
+    match_results[("Tom", "Anna")] = "6:2, 6:1"
+    stats = get_player_statistics("Anna")
+    assert (stats["wins"], stats["losses"]) == (1, 1)
+    assert (stats["sets_won"], stats["sets_lost"]) == (2, 3)
+    assert (stats["games_won"], stats["games_lost"]) == (19, 28)
+    assert stats["tiebreaks_won"] == 1
+    del match_results[("Tom", "Anna")]
+    match_results[("Anna", "Max")] = "2:6, 2:6"
+    stats = get_player_statistics("Anna")
+    assert (stats["wins"], stats["losses"], stats["games_won"], stats["tiebreaks_won"]) == (0, 1, 4, 0)
+    assert get_player_statistics("Tom")["wins"] == 0
+    match_results.clear()
+    assert get_player_statistics("Anna") == get_player_statistics("Unbekannt")
+
+def test_player_statistics_rebuilt_on_load(reset_globals):
+    match_results[("Anna", "Max")] = "6:0, 6:0"
+    mock_data = json.dumps({
+        "players": ["Anna", "Max"],
+        "matches": [{"id": 1, "player1": "Anna", "player2": "Max", "day": 1, "court": 1, "status": "completed", "result": "4:6, 4:6", "winner": "Max"}],
+        "days": [{"number": 1, "status": "completed", "date": "2025-04-02"}]
+    })
+    with patch("builtins.open", mock_open(read_data=mock_data)):
+        assert load_tournament("test_turnier.json").success
+    assert get_player_statistics("Anna")["wins"] == 0
+    assert get_player_statistics("Max")["wins"] == 1
+    assert get_player_statistics("Max")["games_won"] == 12
+
+def test_parse_score():
+    parsed = parse_score(" 6:4,3:6 , 7:6")
+    assert parsed.sets == ((6, 4), (3, 6), (7, 6))
+    assert (parsed.p1_sets, parsed.p2_sets, parsed.winner) == (2, 1, 1)
+    assert parsed.reversed().sets == ((4, 6), (6, 3), (6, 7))
+    assert parsed.reversed().winner == 2
+    assert parsed.compact() == "6:4,3:6,7:6"
+    with pytest.raises(ValueError):
+        parse_score("6-4")
+
+def test_record_result_stores_parsed_score():
+    setup_reset_globals()
+    players = ["Anna", "Max"]
+    pairs = generate_round_robin_pairs(players)
+    create_schedule(pairs, players)
+    record_result("Max", "Anna", "4:6, 6:7")
+    assert match_results[("Max", "Anna")] == "4:6, 6:7"
+    assert match_results.parsed[("Max", "Anna")].sets == ((4, 6), (6, 7))
+    assert get_parsed_result("Anna", "Max").winner == 1
+    assert "Gewonnen (4:6, 6:7)" in get_player_schedule("Anna")
+    assert "Verloren (4:6, 6:7)" in get_player_schedule("Max")
+    assert "Match-Verlauf: W" in create_player_performance("Anna")
+    assert "Match-Verlauf: L" in create_player_performance("Max")
+
+def test_match_index_lookup_is_order_independent():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa"]
+    pairs = generate_round_robin_pairs(players)
+    organize_match_days(pairs, players)
+    info = get_match_info("Max", "Anna")
+    assert (info["player1"], info["player2"]) == ("Anna", "Max")
+    assert match_days[info["day"]]["matches"][info["court"] - 1] == ("Anna", "Max")
+    assert info["status"] == "scheduled" and info["result"] is None
+    record_result("Max", "Anna", "6:4, 6:4")
+    info = get_match_info("Anna", "Max")
+    assert (info["status"], info["result"]) == ("completed", "6:4, 6:4")
+    with pytest.raises(ValueError):
+        record_result("Anna", "Max", "6:1, 6:1")
+    assert get_match_info("Anna", "Unbekannt") is None
+
+def test_match_index_follows_reschedule():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa"]
+    pairs = generate_round_robin_pairs(players)
+    organize_match_days(pairs, players)
+    day = get_match_info("Anna", "Max")["day"]
+    first, second = match_days[day]["matches"]
+    reschedule_match(*first, 7)
+    assert get_match_info(*first)["day"] == 7
+    assert get_match_info(*first)["court"] == 1
+    assert get_match_info(*second)["court"] == 1
+    for day_num, day in match_days.items():
+        for court, pair in enumerate(day["matches"], 1):
+            assert (get_match_info(*pair)["day"], get_match_info(*pair)["court"]) == (day_num, court)
+
+def test_player_appearances_follow_reschedule(capsys):
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa"]
+    pairs = generate_round_robin_pairs(players)
+    organize_match_days(pairs, players)
+    assert [e.day for e in match_index.player_entries("Anna")] == [1, 2, 3]
+    first_day = get_match_info("Anna", "Max")["day"]
+    reschedule_match("Anna", "Max", 5)
+    anna_days = [e.day for e in match_index.player_entries("Anna")]
+    assert anna_days == sorted(anna_days) and anna_days[-1] == 5 and first_day not in anna_days
+    assert get_player_schedule("Max").count("Max vs.") == 3
+    assert "Tag 5: Max vs. Anna (Court 1)" in get_player_schedule("Max")
+    with pytest.raises(ValueError):
+        reschedule_match("Anna", "Tom", 5)
+
+    # Index-Pfad und Einzeldurchlauf liefern denselben Fairness-Bericht
+    from tournament_scheduler import current_schedule as live_schedule
+    check_fairness(live_schedule, players)
+    indexed = capsys.readouterr().out
+    check_fairness([list(r) for r in live_schedule], players)
+    assert capsys.readouterr().out == indexed
+
+def test_reschedule_matches_rain_out(reset_globals, tmp_path):
+    players.extend(["Anna", "Max", "Tom", "Lisa", "Jörg", "Eva"])
+    organize_match_days(generate_round_robin_pairs(players), players)
+    record_result(*match_days[2]["matches"][0], "6:1, 6:1")
+    before = {d: list(day["matches"]) for d, day in match_days.items()}
+
+    # Ein gespieltes Match in der Liste: nichts wird verschoben
+    moves = [(p1, p2, 9) for p1, p2 in before[1]] + [(*before[2][0], 9)]
+    result = reschedule_matches(moves)
+    assert not result.success
+    assert result.details == [(len(moves), "Bereits gespieltes Match kann nicht verschoben werden!")]
+    assert {d: day["matches"] for d, day in match_days.items()} == before
+
+    # Regentag: Tag 1 komplett auf einen neuen Tag, Tag 3 tauscht in den frei werdenden Tag
+    filename = str(tmp_path / "turnier.json")
+    assert open_journal(filename).success
+    moves = [(p1, p2, 9) for p1, p2 in before[1]] + [(p1, p2, 1) for p1, p2 in before[3]]
+    assert reschedule_matches(moves).success
+    assert match_days[9]["matches"] == before[1] and match_days[1]["matches"] == before[3]
+    assert 3 not in match_days
+    for day_num, day in match_days.items():
+        for court, pair in enumerate(day["matches"], 1):
+            assert (get_match_info(*pair)["day"], get_match_info(*pair)["court"]) == (day_num, court)
+            assert match_index.plays_on(pair[0], day_num) and match_index.plays_on(pair[1], day_num)
+    assert [e.day for e in match_index.player_entries("Anna")] == sorted(
+        e.day for e in match_index.player_entries("Anna"))
+    assert not reschedule_matches([(*before[2][1], 9)]).success
+    _assert_index_matches_rebuild()
+
+    simulate_crash()
+    match_days.clear()
+    match_results.clear()
+    assert open_journal(filename).success
+    assert {d: day["matches"] for d, day in match_days.items()} == {
+        1: before[3], 2: before[2], 4: before[4], 5: before[5], 9: before[1]}
+    close_journal()
+
+def test_reschedule_matches_respects_constraints(reset_globals):
+    players.extend(["Anna", "Max", "Tom", "Lisa"])
+    pairs = generate_round_robin_pairs(players)
+    assert organize_constrained_match_days(pairs, players, courts=1, unavailable={"Tom": [4]}).success
+    first = match_days[1]["matches"][0]
+    tom_match = next(pair for d, day in match_days.items() if d != 1
+                     for pair in day["matches"] if "Tom" in pair)
+    other = next(pair for d, day in match_days.items() if d != 1
+                 for pair in day["matches"] if not set(pair) & set(first))
+    result = reschedule_matches([(*tom_match, 4), (*other, 1)])
+    assert not result.success
+    assert result.details == [(1, "Tom ist an Tag 4 nicht verfügbar!")]
+    assert reschedule_matches([(*other, 1)]).details == [(1, "An Tag 1 ist kein Court mehr frei!")]
+    # Gleichzeitig frei gemacht passt es
+    assert reschedule_matches([(*first, 7), (*other, 1)]).success
+    assert match_days[1]["matches"] == [other] and match_days[7]["matches"] == [first]
+
+def test_load_tournament_drops_old_constraints(reset_globals, tmp_path):
+    other = Tournament("Anderes Turnier")
+    others = [f"Gast{i}" for i in range(8)]
+    other.players.extend(others)
+    other.organize_match_days(generate_round_robin_pairs(others), others)
+    filename = str(tmp_path / "anderes.json")
+    assert other.save_tournament(filename).success
+
+    players.extend(["Spieler0", "Spieler1", "Spieler2", "Spieler3"])
+    assert organize_constrained_match_days(generate_round_robin_pairs(players), players, courts=1,
+                                           unavailable={"Spieler0": {1, 2, 3}}).success
+    assert load_tournament(filename).success
+    assert default_tournament.constraints is None
+    first, second = match_days[1]["matches"][:2]
+    assert reschedule_matches([(*first, 9), (*second, 9)]).success
+
+def _day_map():
+    return {d: list(day["matches"]) for d, day in match_days.items()}
+
+def _assert_index_matches_rebuild():
+    # Die inkrementell nachgeführten Masken und Listen entsprechen einem Neuaufbau
+    fresh = MatchIndex(match_days, match_results).refresh()
+    index = match_index.refresh()
+    assert (index.days, index.completed, index.load) == (fresh.days, fresh.completed, fresh.load)
+    assert {p: m for p, m in index.player_days.items() if m} == dict(fresh.player_days)
+    for player, entries in fresh.appearances.items():
+        assert [(e.pair, e.day, e.court) for e in index.appearances[player]] == [
+            (e.pair, e.day, e.court) for e in entries]
+
+def test_repair_cancelled_day_and_blocked_player(reset_globals):
+    players.extend(["Anna", "Max", "Tom", "Lisa", "Jörg", "Eva"])
+    organize_match_days(generate_round_robin_pairs(players), players)
+    mark_day_completed(1)
+    played, *open_pairs = match_days[2]["matches"]
+    record_result(*played, "6:4, 6:4")
+    before = _day_map()
+
+    result = cancel_match_day(2)
+    assert result.success, result.message
+    assert sorted(item["pair"] for item in result.details) == sorted(open_pairs)
+    after = _day_map()
+    assert after[2] == [played]
+    # Nur die offenen Matches von Tag 2 haben sich bewegt, nichts landet auf Tag 1 oder 2
+    assert all(item["day"] > 2 for item in result.details)
+    assert {p for d in after for p in after[d]} == {p for d in before for p in before[d]}
+    assert all(pair in after[d] for d in before if d != 2 for pair in before[d])
+    _assert_valid_schedule([after[d] for d in sorted(after)], players)
+    _assert_index_matches_rebuild()
+    assert get_next_scheduled_day() == 2
+
+    anna_day = next(e.day for e in match_index.player_entries("Anna") if e.day > 2)
+    moved = next(e.pair for e in match_index.player_entries("Anna") if e.day == anna_day)
+    before = _day_map()
+    result = block_player_days("Anna", [anna_day])
+    assert result.success and [item["pair"] for item in result.details] == [moved]
+    assert not match_index.plays_on("Anna", anna_day)
+    after = _day_map()
+    assert [p for p in before[anna_day] if p != moved] == after[anna_day]
+    assert all(after[d][:len(before[d])] == before[d] for d in before if d != anna_day)
+    assert not reschedule_matches([(*moved, anna_day)]).success
+    assert reschedule_matches([(*moved, 0)]).details == [(1, "Ungültiger Spieltag 0!")]
+    assert cancel_match_day(1).message == "Tag 1 ist bereits abgeschlossen"
+    _assert_index_matches_rebuild()
+
+def test_player_blocks_survive_crash_and_snapshots(reset_globals, tmp_path):
+    players.extend([f"Spieler{i}" for i in range(5)])
+    organize_match_days(generate_round_robin_pairs(players), players)
+    filename = str(tmp_path / "turnier.json")
+    assert open_journal(filename).success
+    assert block_player_days("Spieler0", [1, 2]).success
+    expected = _day_map()
+
+    simulate_crash()
+    default_tournament.constraints = None
+    match_days.clear()
+    assert open_journal(filename).success
+    assert _day_map() == expected
+    assert default_tournament.constraints.unavailable == {"Spieler0": {1, 2}}
+    result = cancel_match_day(3)
+    assert result.success, result.message
+    assert not match_index.plays_on("Spieler0", 1) and not match_index.plays_on("Spieler0", 2)
+    close_journal()
+
+    default_tournament.constraints.courts = 2
+    for save, load in ((save_tournament, load_tournament), (save_tournament, load_tournament_streaming),
+                       (save_binary_snapshot, load_binary_snapshot)):
+        path = str(tmp_path / ("turnier.snap" if save is save_binary_snapshot else "kopie.json"))
+        assert save(path).success
+        default_tournament.constraints = None
+        assert load(path).success
+        assert default_tournament.constraints.as_dict() == {
+            "courts": 2, "unavailable": {"Spieler0": [1, 2]}, "max_matches_per_day": 1, "max_days": None}
+    close_binary_snapshots()
+
+def test_add_late_entrant_fills_byes(reset_globals, tmp_path):
+    players.extend(["Anna", "Max", "Tom", "Lisa", "Jörg"])
+    organize_match_days(generate_round_robin_pairs(players), players)
+    before = _day_map()
+    filename = str(tmp_path / "turnier.json")
+    assert open_journal(filename).success
+
+    result = add_late_entrant("Eva")
+    assert result.success, result.message
+    assert add_late_entrant("Eva").success is False
+    # Jeder Tag hatte einen spielfreien Spieler: Eva füllt genau diese Lücken
+    assert sorted(match_days) == sorted(before)
+    for d in before:
+        assert match_days[d]["matches"][:len(before[d])] == before[d]
+    assert get_match_info("Eva", "Anna")["status"] == "scheduled"
+    _assert_valid_schedule([match_days[d]["matches"] for d in sorted(match_days)], players)
+    _assert_index_matches_rebuild()
+    expected = _day_map()
+
+    simulate_crash()
+    match_days.clear()
+    players.clear()
+    assert open_journal(filename).success
+    assert _day_map() == expected and "Eva" in players
+    close_journal()
+
+def test_save_tournament_winner_and_round_trip(reset_globals, tmp_path):
+    players.extend(["Anna", "Max", "Tom", "Lisa"])
+    organize_match_days(generate_round_robin_pairs(players), players)
+    record_result("Max", "Anna", "3:6, 4:6")
+    record_result("Tom", "Lisa", "6:3, 6:7, 6:4")
+    filename = str(tmp_path / "turnier.json")
+    assert save_tournament(filename).success
+    with open(filename, encoding="utf-8") as f:
+        data = json.load(f)
+    matches = {(m["player1"], m["player2"]): m for m in data["matches"]}
+    assert matches[("Anna", "Max")]["winner"] == "Anna"
+    assert matches[("Tom", "Lisa")]["winner"] == "Tom"
+    assert matches[("Anna", "Tom")]["winner"] is None
+    assert sorted(m["id"] for m in data["matches"]) == list(range(1, 7))
+    assert data["current_standings"][0] == {"player": "Anna", "matches_won": 1, "matches_lost": 0, "points": 1}
+
+    saved_days = {d: list(day["matches"]) for d, day in match_days.items()}
+    assert load_tournament(filename).success
+    assert {d: day["matches"] for d, day in match_days.items()} == saved_days
+    # Ergebnisse werden aus Sicht von player1 gespeichert
+    assert get_match_result("Anna", "Max") == "6:3, 6:4"
+    assert get_parsed_result("Max", "Anna").winner == 2
+    assert get_match_info("Tom", "Lisa")["status"] == "completed"
+
+def test_journal_recovers_after_crash(reset_globals, tmp_path):
+    filename = str(tmp_path / "turnier.json")
+    players.extend(["Anna", "Max", "Tom", "Lisa"])
+    organize_match_days(generate_round_robin_pairs(players), players)
+    assert open_journal(filename, batch_size=2).success
+    record_result("Max", "Anna", "3:6, 4:6")
+    reschedule_match("Tom", "Lisa", 9)
+    mark_day_completed(1)
+    # Absturz: kein close_journal, letzter Eintrag nur halb geschrieben
+    simulate_crash()
+    with open(filename + ".journal", "a", encoding="utf-8") as f:
+        f.write('{"op": "result", "player1": "An')
+
+    match_results.clear()
+    match_days.clear()
+    players.clear()
+    result = open_journal(filename)
+    assert result.success, result.message
+    assert get_match_result("Anna", "Max") == "3:6, 4:6"
+    assert get_match_info("Tom", "Lisa")["day"] == 9
+    assert match_days[1]["completed"]
+    record_result("Anna", "Tom", "6:1, 6:1")
+    close_journal()
+    with open(filename + ".journal", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 4
+    assert json.loads(lines[-1])["player2"] == "Tom"
+
+def test_journal_compaction(reset_globals, tmp_path):
+    filename = str(tmp_path / "turnier.json")
+    players.extend(["Anna", "Max", "Tom", "Lisa"])
+    organize_match_days(generate_round_robin_pairs(players), players)
+    assert open_journal(filename, compact_every=2).success
+    record_result("Anna", "Max", "6:3, 6:4")
+    record_result("Tom", "Lisa", "6:3, 6:4")
+    assert os.path.getsize(filename + ".journal") == 0
+    record_result("Anna", "Tom", "6:3, 6:4")
+    close_journal()
+
+    match_results.clear()
+    assert load_tournament(filename).success
+    assert get_match_result("Tom", "Lisa") == "6:3, 6:4"
+    assert get_match_result("Anna", "Tom") is None
+    assert open_journal(filename).success
+    assert get_match_result("Anna", "Tom") == "6:3, 6:4"
+    close_journal()
+
+def test_journal_keeps_score_format(reset_globals, tmp_path):
+    filename = str(tmp_path / "turnier.json")
+    players.extend(["Anna", "Max", "Tom", "Lisa"])
+    organize_match_days(generate_round_robin_pairs(players), players)
+    assert open_journal(filename).success
+    try:
+        assert set_score_format("match_tiebreak").success
+        record_result("Anna", "Max", "6:3, 3:6, 10:8")
+        simulate_crash()
+        set_score_format("standard")
+        match_results.clear()
+
+        result = open_journal(filename)
+        assert result.success, result.message
+        assert get_match_result("Anna", "Max") == "6:3, 3:6, 10:8"
+        assert default_tournament.score_format is SCORE_FORMATS["match_tiebreak"]
+        compact_journal()
+        close_journal()
+
+        set_score_format("standard")
+        assert load_tournament(filename).success
+        assert default_tournament.score_format is SCORE_FORMATS["match_tiebreak"]
+        set_score_format("standard")
+        assert load_tournament_streaming(filename).success
+        assert default_tournament.score_format is SCORE_FORMATS["match_tiebreak"]
+    finally:
+        set_score_format("standard")
+
+def _tournament_state():
+    return (list(players), dict(match_results),
+            {d: (list(day["matches"]), day["completed"]) for d, day in match_days.items()},
+            [list(r) for r in tournament_scheduler.current_schedule])
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_load_tournament_streaming_matches_load_tournament(reset_globals, tmp_path, indent):
+    players.extend(["Anna", "Max", "Tom", "Lisa", "Eva"])
+    organize_match_days(generate_round_robin_pairs(players), players)
+    record_result("Max", "Anna", "3:6, 4:6")
+    record_result("Tom", "Eva", "7:6, 6:7, 6:4")
+    mark_day_completed(2)
+    filename = str(tmp_path / "turnier.json")
+    assert save_tournament(filename).success
+    if indent:
+        # Dateien im alten Format (json.dump mit indent=2) müssen ebenfalls lesbar sein
+        with open(filename, encoding="utf-8") as f:
+            data = json.load(f)
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+
+    assert load_tournament(filename).success
+    expected = _tournament_state()
+    match_results.clear()
+    match_days.clear()
+    result = load_tournament_streaming(filename, chunk_size=7)
+    assert result.success, result.message
+    assert _tournament_state() == expected
+    assert get_match_info("Anna", "Max")["status"] == "completed"
+
+def test_load_tournament_streaming_truncated_file(reset_globals, tmp_path):
+    players.extend(["Anna", "Max", "Tom", "Lisa"])
+    organize_match_days(generate_round_robin_pairs(players), players)
+    record_result("Anna", "Max", "6:3, 6:4")
+    before = _tournament_state()
+    filename = str(tmp_path / "kaputt.json")
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write('{"players": ["X", "Y"], "matches": [{"player1": "X", "player2": "Y", "day": 1, "result": ""}, {"res')
+    result = load_tournament_streaming(filename)
+    assert not result.success
+    assert result.message.startswith("Fehler beim Laden")
+    assert _tournament_state() == before
+
+    # Abgeschnittener binärer Snapshot: der aktuelle Zustand bleibt ebenfalls erhalten
+    snapshot_file = str(tmp_path / "turnier.snap")
+    assert save_binary_snapshot(snapshot_file).success
+    close_binary_snapshots()
+    with open(snapshot_file, "r+b") as f:
+        f.truncate(os.path.getsize(snapshot_file) - 20)
+    record_result("Tom", "Lisa", "6:1, 6:1")
+    before = _tournament_state()
+    assert not load_binary_snapshot(snapshot_file).success
+    close_binary_snapshots()
+    assert _tournament_state() == before
+    assert get_match_info("Tom", "Lisa")["status"] == "completed"
+
+def test_binary_snapshot_round_trip(reset_globals, tmp_path):
+    players.extend(["Anna", "Max", "Tom", "Lisa", "Jörg"])
+    organize_match_days(generate_round_robin_pairs(players), players)
+    record_result("Max", "Anna", "3:6, 4:6")
+    record_result("Tom", "Jörg", "7:6, 6:7, 6:4")
+    mark_day_completed(1)
+    reschedule_match("Lisa", "Jörg", 8)
+    json_file = str(tmp_path / "turnier.json")
+    binary_file = str(tmp_path / "turnier.snap")
+    assert save_tournament(json_file).success
+    assert save_binary_snapshot(binary_file).success
+
+    assert load_tournament(json_file).success
+    expected = _tournament_state()
+    snapshot = open_binary_snapshot(binary_file)
+    assert open_binary_snapshot(binary_file) is snapshot
+    assert snapshot.players == players
+    assert snapshot.match_count == 10
+    first = snapshot.match(0)
+    assert (first["day"], first["court"]) == (1, 1)
+    played = [m for m in snapshot.matches() if m["status"] == "completed"]
+    assert sorted(m["sets"] for m in played) == [((6, 3), (6, 4)), ((7, 6), (6, 7), (6, 4))]
+
+    match_results.clear()
+    match_days.clear()
+    assert load_binary_snapshot(binary_file).success
+    assert _tournament_state() == expected
+
+    # Binär -> JSON -> Binär liefert dieselbe Datei
+    assert save_tournament(json_file).success
+    assert load_tournament(json_file).success
+    second_file = str(tmp_path / "zweiter.snap")
+    assert save_binary_snapshot(second_file).success
+    close_binary_snapshots()
+    with open(binary_file, "rb") as a, open(second_file, "rb") as b:
+        assert a.read() == b.read()
+
+def test_binary_snapshot_rejects_other_files(tmp_path):
+    filename = str(tmp_path / "kein.snap")
+    with open(filename, "wb") as f:
+        f.write(b"x" * 100)
+    result = load_binary_snapshot(filename)
+    assert not result.success
+    assert "kein gültiger Snapshot" in result.message
+
+def test_player_ids_and_result_columns():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom"]
+    pairs = generate_round_robin_pairs(players)
+    create_schedule(pairs, players)
+    ids = [intern_player(p) for p in players]
+    assert len(set(ids)) == 3
+    assert [player_names[i] for i in ids] == players
+    assert intern_player("Anna") == ids[0]
+    assert find_match_key("Anna", "Max") == find_match_key("Max", "Anna") == match_key("Anna", "Max")
+    assert find_match_key("Anna", "Niemand") is None
+
+    record_result("Anna", "Max", "6:3, 6:4")
+    record_result("Tom", "Anna", "7:6, 6:7, 6:2")
+    record_result("Max", "Tom", "6:0, 6:0")
+    columns = match_results.columns
+    assert len(columns) == 3
+    del match_results[("Anna", "Max")]
+    assert len(columns) == 2
+    assert sorted(map(columns.match_key, range(2))) == sorted([match_key("Max", "Tom"), match_key("Anna", "Tom")])
+    row = columns.row_of(match_key("Max", "Tom"))
+    assert (columns.player1[row], columns.player2[row]) == (ids[1], ids[2])
+    assert list(columns.games[row * 10:row * 10 + 4]) == [6, 0, 6, 0]
+    row = columns.row_of(match_key("Anna", "Tom"))
+    assert columns.set_count[row] == 3
+    assert columns.parsed(row) == parse_score("7:6, 6:7, 6:2")
+    assert match_results.key_for("Anna", "Tom") == ("Tom", "Anna")
+    assert get_player_statistics("Anna")["games_won"] == 15
+    # Gelesen wird aus den Spalten, nicht über den Cache von parse_score
+    tournament_scheduler._parse_cache.clear()
+    assert match_results.parsed[("Max", "Tom")] == parse_score("6:0, 6:0")
+    assert match_results.parsed[("Tom", "Anna")].sets == ((7, 6), (6, 7), (6, 2))
+    assert dict(match_results.parsed.items())[("Tom", "Anna")].winner == 1
+    tournament_scheduler._parse_cache.clear()
+    assert get_parsed_result("Anna", "Tom").winner == 2
+    assert not tournament_scheduler._parse_cache
+
+def test_recompute_player_statistics_matches_incremental():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa", "Eva"]
+    pairs = generate_round_robin_pairs(players)
+    create_schedule(pairs, players)
+    scores = ["6:3, 6:4", "4:6, 7:6, 6:7", "7:6, 6:7, 7:5", "0:6, 6:0, 7:6", "6:7, 6:7"]
+    for (p1, p2), score in zip(pairs, scores * 2):
+        record_result(p1, p2, score)
+    del match_results[pairs[3]]
+    batch = get_all_player_statistics(players)
+    assert batch == {p: get_player_statistics(p) for p in players}
+    recomputed = recompute_player_statistics()
+    assert {p: recomputed[p] for p in players} == batch
+    assert recompute_player_statistics(replace=True)["Anna"] == batch["Anna"]
+    assert get_all_player_statistics(["Niemand"]) == {"Niemand": get_player_statistics("Niemand")}
+
+def test_standings_head_to_head_decides_tie():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa"]
+    create_schedule(generate_round_robin_pairs(players), players)
+    # Anna, Max und Tom haben je 2 Siege; nur Lisa verliert alles
+    record_result("Anna", "Max", "6:4, 6:4")
+    record_result("Max", "Tom", "6:0, 6:0")
+    record_result("Tom", "Anna", "6:4, 6:4")
+    record_result("Anna", "Lisa", "7:6, 7:6")
+    record_result("Max", "Lisa", "6:0, 6:0")
+    record_result("Tom", "Lisa", "6:3, 6:3")
+    standings = calculate_standings(players)
+    # Direkter Vergleich ist zyklisch (je 1 Sieg), daher entscheidet die Satzquote (alle 4:2),
+    # dann die Spielquote: Max 32:12, Anna 34:32, Tom 24:26
+    assert [e["player"] for e in standings] == ["Max", "Anna", "Tom", "Lisa"]
+    for order in (players[::-1], ["Tom", "Lisa", "Max", "Anna"]):
+        assert [e["player"] for e in calculate_standings(order)] == ["Max", "Anna", "Tom", "Lisa"]
+
+def test_standings_head_to_head_before_ratios():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom"]
+    create_schedule(generate_round_robin_pairs(players), players)
+    record_result("Max", "Anna", "7:6, 7:6")
+    record_result("Anna", "Tom", "6:0, 6:0")
+    record_result("Tom", "Max", "6:0, 6:0")
+    # Alle 1 Sieg, aber jetzt nur Max und Tom punktgleich betrachtet:
+    standings = calculate_standings(["Max", "Tom"])
+    assert [e["player"] for e in standings] == ["Tom", "Max"]
+    # Ohne direkten Vergleich entscheidet bei Gleichstand die Meldereihenfolge
+    setup_reset_globals()
+    create_schedule(generate_round_robin_pairs(players), players)
+    assert [e["player"] for e in calculate_standings(["Tom", "Anna", "Max"])] == ["Tom", "Anna", "Max"]
+
+def test_ranking_timeline_replays_results():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa", "Eva"]
+    pairs = generate_round_robin_pairs(players)
+    create_schedule(pairs, players)
+    scores = ["6:3, 6:4", "4:6, 7:6, 6:7", "7:6, 6:7, 7:5", "0:6, 6:0, 7:6", "6:7, 6:7"]
+    # Erwartung: nach jedem Ergebnis die komplette Tabelle neu berechnen
+    expected = {p: [] for p in players}
+    for (p1, p2), score in zip(pairs, scores * 2):
+        for p in (p1, p2):
+            if not expected[p]:
+                expected[p].append(get_player_ranking(p))
+        record_result(p1, p2, score)
+        for p in (p1, p2):
+            expected[p].append(get_player_ranking(p))
+    timeline = build_ranking_timeline()
+    assert timeline == expected
+    assert all(len(timeline[p]) == len(get_player_matches(p)) + 1 for p in players)
+
+def test_ranking_timeline_is_extended_incrementally():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa", "Eva", "Paul"]
+    pairs = generate_round_robin_pairs(players)
+    create_schedule(pairs, players)
+    scores = ["6:3, 6:4", "4:6, 7:6, 6:7", "7:6, 6:7, 7:5", "0:6, 6:0, 7:6", "6:7, 6:7", "6:1, 6:2"]
+    expected = {p: [] for p in players}
+    for i, ((p1, p2), score) in enumerate(zip(pairs, scores * 3)):
+        for p in (p1, p2):
+            if not expected[p]:
+                expected[p].append(get_player_ranking(p))
+        record_result(p1, p2, score)
+        for p in (p1, p2):
+            expected[p].append(get_player_ranking(p))
+        if i == 0:
+            build_ranking_timeline()
+            live = default_tournament.ranking_timeline
+    assert build_ranking_timeline() == expected
+    assert default_tournament.ranking_timeline is live  # fortgeschrieben, nicht neu aufgebaut
+    assert build_ranking_timeline() == build_ranking_timeline(default_tournament._ranking_players())
+
+    # Ein ersetztes Ergebnis erzwingt den Neuaufbau
+    match_results[pairs[0]] = "0:6, 0:6"
+    rebuilt = build_ranking_timeline()
+    assert default_tournament.ranking_timeline is not live
+    assert rebuilt == build_ranking_timeline(default_tournament._ranking_players())
+    assert rebuilt["Anna"][1] != expected["Anna"][1]
+
+def test_performance_shows_rank_history():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom"]
+    create_schedule(generate_round_robin_pairs(players), players)
+    record_result("Max", "Tom", "6:0, 6:0")
+    record_result("Anna", "Max", "6:0, 6:0")
+    record_result("Anna", "Tom", "6:0, 6:0")
+    perf = create_player_performance("Tom")
+    # Tom hält nach der ersten Niederlage noch Platz 2 und rutscht dann ans Ende
+    assert "Start  : #2" in perf
+    assert "Nach 1 : #2 -" in perf
+    assert "Nach 2 : #3 ↓" in perf
+    perf = create_player_performance("Anna")
+    assert "Start  : #3" in perf
+    assert "Nach 1 : #1 ↑" in perf
+    assert "Nach 2 : #1 -" in perf
+
+def test_standings_cache_hits_until_state_changes():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa"]
+    organize_match_days(generate_round_robin_pairs(players), players)
+    record_result("Anna", "Max", "6:3, 6:4")
+    before = get_cache_stats()
+    ranking = get_complete_ranking()
+    assert get_player_ranking("Anna") == 1
+    get_tournament_progress()
+    get_tournament_progress()
+    ranking[0]["player"] = "Verändert"
+    assert get_complete_ranking()[0]["player"] == "Anna"
+    after = get_cache_stats()
+    assert after["misses"] - before["misses"] == 3  # Tabelle, Positionen, Fortschritt
+    assert after["hits"] - before["hits"] >= 3
+
+    record_result("Tom", "Anna", "6:3, 6:4")
+    assert get_cache_stats()["version"] == after["version"]
+    assert "Tom" in get_tournament_progress().split("Tabellenführer: ")[1]
+    assert get_cache_stats()["version"] != after["version"]
+    # Auch direkte Änderungen an match_results machen den Zwischenspeicher ungültig
+    del match_results[("Tom", "Anna")]
+    assert get_complete_ranking()[0]["player"] == "Anna"
+
+def test_tournament_instances_are_independent(tmp_path):
+    setup_reset_globals()
+    first = Tournament("Herbst")
+    second = Tournament("Winter")
+    first.players.extend(["Anna", "Max", "Tom"])
+    second.players.extend(["Tom", "Lisa"])
+    first.organize_match_days(generate_round_robin_pairs(first.players), first.players)
+    second.organize_match_days(generate_round_robin_pairs(second.players), second.players)
+    first.record_result("Anna", "Max", "6:3, 6:4")
+    second.record_result("Lisa", "Tom", "6:0, 6:0")
+
+    assert first.get_match_result("Lisa", "Tom") is None
+    assert second.get_player_statistics("Tom")["losses"] == 1
+    assert first.get_player_statistics("Tom")["losses"] == 0
+    assert first.get_complete_ranking()[0]["player"] == "Anna"
+    assert len(match_results) == 0 and not match_days
+    assert first.save_tournament(str(tmp_path / "herbst.json")).success
+    with open(tmp_path / "herbst.json", encoding="utf-8") as f:
+        assert json.load(f)["tournament_name"] == "Herbst"
+
+def test_module_api_keeps_current_schedule_object():
+    setup_reset_globals()
+    schedule = tournament_scheduler.current_schedule
+    players = ["Anna", "Max", "Tom", "Lisa"]
+    assert create_schedule(generate_round_robin_pairs(players), players) is schedule
+    reschedule_match("Anna", "Lisa", 7)
+    assert tournament_scheduler.current_schedule is schedule is current_schedule
+    assert ("Anna", "Lisa") in schedule[-1]
+    assert default_tournament.match_results is match_results
+
+def test_check_fairness_returns_metrics(capsys):
+    schedule = [[("Anna", "Max")], [("Tom", "Lisa")], [("Anna", "Tom")], [("Max", "Lisa")],
+                [("Anna", "Lisa")], [("Max", "Tom")]]
+    metrics = check_fairness(schedule, ["Anna", "Max", "Tom", "Lisa"], verbose=False)
+    assert capsys.readouterr().out == ""
+    assert metrics["players"]["Anna"]["gaps"] == [2, 2]
+    assert metrics["players"]["Max"]["gaps"] == [3, 2]
+    assert metrics["players"]["Max"]["longest_idle"] == 2
+    assert metrics["max_idle"] == 2
+    assert metrics["back_to_back"] == 2  # Tom in Runde 1 und 2, Lisa in Runde 3 und 4
+    assert metrics == schedule_fairness(schedule)
+
+def _assert_valid_schedule(schedule, players):
+    played = sorted(tuple(sorted(pair)) for round_games in schedule for pair in round_games)
+    assert played == sorted(tuple(sorted(pair)) for pair in generate_round_robin_pairs(players))
+    for round_games in schedule:
+        in_round = [p for pair in round_games for p in pair]
+        assert len(in_round) == len(set(in_round))
+
+def test_optimize_schedule_is_deterministic_and_valid():
+    players = [f"S{i}" for i in range(9)]
+    schedule = tournament_scheduler._greedy_match_days(generate_round_robin_pairs(players), players)
+    before = schedule_fairness(schedule)
+    optimized, metrics = optimize_schedule(schedule, time_budget=30, seed=3, iterations=3000, frozen=[0])
+    again, _ = optimize_schedule(schedule, time_budget=30, seed=3, iterations=3000, frozen=[0])
+    assert optimized == again
+    # Worker 0 rechnet mit demselben Seed, der Pool kann also nur besser werden
+    _, pooled = optimize_schedule(schedule, time_budget=30, seed=3, iterations=3000, workers=2, frozen=[0])
+    assert pooled["score"] <= metrics["score"]
+    assert optimized[0] == schedule[0]
+    assert metrics["score"] < before["score"]
+    assert metrics["max_idle"] <= before["max_idle"]
+    _assert_valid_schedule(optimized, players)
+
+def test_optimize_match_days_keeps_played_days():
+    setup_reset_globals()
+    players = [f"S{i}" for i in range(9)]
+    organize_match_days(generate_round_robin_pairs(players), players, method="greedy")
+    first_day = list(match_days[1]["matches"])
+    record_result(*first_day[0], "6:3, 6:4")
+    result = optimize_match_days(time_budget=30, seed=1, iterations=2000)
+    assert result.success
+    assert match_days[1]["matches"] == first_day
+    assert result.details["score"] <= schedule_fairness(
+        tournament_scheduler._greedy_match_days(generate_round_robin_pairs(players), players))["score"]
+    _assert_valid_schedule(tournament_scheduler.current_schedule, players)
+    assert get_match_info(*first_day[0])["status"] == "completed"
+
+def test_constrained_schedule_respects_courts_and_unavailable_days():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom", "Lisa", "Eva", "Paul"]
+    result = organize_constrained_match_days(generate_round_robin_pairs(players), players, courts=2,
+                                             unavailable={"Anna": {1, 2}, "Tom": {3}})
+    assert result.success and result.details == []
+    assert sum(len(day["matches"]) for day in match_days.values()) == 15
+    for day_num, day in match_days.items():
+        assert len(day["matches"]) <= 2
+        in_day = [p for pair in day["matches"] for p in pair]
+        assert len(in_day) == len(set(in_day))
+        assert not ("Anna" in in_day and day_num in (1, 2))
+        assert not ("Tom" in in_day and day_num == 3)
+    assert all(get_match_info(*pair)["court"] <= 2 for pair in generate_round_robin_pairs(players))
+    assert default_tournament.constraints.courts == 2
+
+def test_constrained_schedule_reports_unschedulable_pairs():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom"]
+    result = organize_constrained_match_days(generate_round_robin_pairs(players), players, courts=[1, 1],
+                                             unavailable={"Anna": {1}, "Max": {2}})
+    assert not result.success
+    reasons = {tuple(sorted(entry["pair"])): entry["reason"] for entry in result.details}
+    assert reasons[("Anna", "Max")] == "Kein gemeinsamer verfügbarer Spieltag"
+    assert len(reasons) == 1
+    assert sum(len(day["matches"]) for day in match_days.values()) == 2
+
+    days, unscheduled = plan_match_days(generate_round_robin_pairs(players), players, SchedulingConstraints([1]))
+    assert sum(len(day) for day in days.values()) == 1
+    assert [entry["reason"] for entry in unscheduled] == [
+        "Alle gemeinsamen Spieltage sind voll oder das Tageslimit ist erreicht"] * 2
+
+def test_constrained_schedule_rejects_zero_courts():
+    setup_reset_globals()
+    players = ["Anna", "Max", "Tom"]
+    organize_match_days(generate_round_robin_pairs(players), players)
+    before = {d: list(day["matches"]) for d, day in match_days.items()}
+    result = organize_constrained_match_days(generate_round_robin_pairs(players), players, courts=0)
+    assert not result.success and "Platz" in result.message
+    assert {d: day["matches"] for d, day in match_days.items()} == before
+    with pytest.raises(ValueError):
+        SchedulingConstraints(-1)
+
+def test_constrained_schedule_with_two_matches_per_day():
+    days, unscheduled = plan_match_days(generate_round_robin_pairs(["A", "B", "C", "D"]), ["A", "B", "C", "D"],
+                                        SchedulingConstraints(courts=3, max_matches_per_day=2))
+    assert unscheduled == []
+    assert sum(len(day) for day in days.values()) == 6
+    for day in days.values():
+        assert len(day) <= 3
+        assert all(sum(p in pair for pair in day) <= 2 for p in "ABCD")
+
+def test_optimize_match_days_keeps_constraints():
+    setup_reset_globals()
+    players = [f"S{i}" for i in range(8)]
+    unavailable = {"S0": {1, 2, 3}, "S1": {4, 5}}
+    assert organize_constrained_match_days(generate_round_robin_pairs(players), players, courts=3,
+                                           unavailable=unavailable).success
+    for seed in range(3):
+        assert optimize_match_days(time_budget=30, seed=seed, iterations=3000).success
+        for day_num, day in match_days.items():
+            assert len(day["matches"]) <= 3
+            in_day = [p for pair in day["matches"] for p in pair]
+            assert len(in_day) == len(set(in_day))
+            assert all(day_num not in unavailable.get(p, ()) for p in in_day)
+    assert sum(len(day["matches"]) for day in match_days.values()) == 28
+
+def test_benchmark_suite_flags_regressions():
+    import benchmark_tournament
+    report = benchmark_tournament.run_suite(sizes=(6,), memory=False)
+    operations = [row["operation"] for row in report["rows"]]
+    assert "calculate_standings" in operations and len(operations) == 8
+    assert json.loads(json.dumps(report)) == report
+    baseline = json.loads(json.dumps(report))
+    assert benchmark_tournament.compare_with_baseline(report, baseline) == []
+    report["rows"][0]["seconds"] = baseline["rows"][0]["seconds"] * 2 + 0.01
+    regressions = benchmark_tournament.compare_with_baseline(report, baseline)
+    assert [row["operation"] for row in regressions] == [operations[0]]
+    assert regressions[0]["regression"] == ["seconds"]
+
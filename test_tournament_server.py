@@ -0,0 +1,86 @@
+import asyncio
+
+from tournament_scheduler import Tournament, generate_round_robin_pairs
+from tournament_server import MAX_CACHED_RESPONSES, TournamentServer, request
+
+def _tournament():
+    tournament = Tournament("Finale")
+    tournament.players.extend(["Anna", "Max", "Tom", "Lisa"])
+    tournament.organize_match_days(generate_round_robin_pairs(tournament.players), tournament.players)
+    return tournament
+
+def _run(scenario):
+    async def main():
+        server = TournamentServer(_tournament())
+        port = await server.start(port=0)
+        try:
+            return await scenario(server, port)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+def test_record_result_and_read_ranking():
+    async def scenario(server, port):
+        status, body = await request("127.0.0.1", port, "POST", "/results",
+                                     {"player1": "Tom", "player2": "Anna", "score": "6:3, 6:4"})
+        assert status == 200 and body["result"]["status"] == "completed"
+        status, body = await request("127.0.0.1", port, "GET", "/ranking")
+        assert status == 200
+        assert body["ranking"][0]["player"] == "Tom"
+        status, body = await request("127.0.0.1", port, "GET", "/progress")
+        assert "1/6" in body["progress"]
+        status, body = await request("127.0.0.1", port, "GET", "/players/Anna/schedule")
+        assert [m["status"] for m in body["matches"]].count("completed") == 1
+        status, body = await request("127.0.0.1", port, "GET", "/matrix?row=0&col=0&rows=2&cols=2")
+        assert body["matrix"][0] == ["", "Anna", "Max"] and len(body["matrix"]) == 3
+    _run(scenario)
+
+def test_errors_are_reported_as_json():
+    async def scenario(server, port):
+        status, body = await request("127.0.0.1", port, "POST", "/results",
+                                     {"player1": "Tom", "player2": "Anna", "score": "6:5"})
+        assert status == 400 and "6:5" in body["error"]
+        status, body = await request("127.0.0.1", port, "POST", "/results", {"player1": "Tom"})
+        assert status == 400
+        status, body = await request("127.0.0.1", port, "GET", "/unbekannt")
+        assert status == 404 and not body["ok"]
+        info = server.tournament.get_match_info("Anna", "Max")
+        status, body = await request("127.0.0.1", port, "POST", "/reschedule",
+                                     {"player1": "Anna", "player2": "Max", "day": 9})
+        assert status == 200 and body["match"]["day"] == 9 != info["day"]
+        status, body = await request("127.0.0.1", port, "POST", "/results",
+                                     {"player1": "Tom", "player2": "Lisa", "score": 5})
+        assert status == 400 and "score" in body["error"]
+        for query in ("row=-2", "col=-1", "rows=0", "cols=-3"):
+            status, body = await request("127.0.0.1", port, "GET", f"/matrix?{query}")
+            assert status == 400 and not body["ok"]
+
+        def broken():
+            raise RuntimeError("kaputt")
+        server.tournament.get_complete_ranking = broken
+        status, body = await request("127.0.0.1", port, "GET", "/ranking")
+        assert status == 500 and "kaputt" in body["error"]
+    _run(scenario)
+
+def test_concurrent_reads_share_one_snapshot():
+    async def scenario(server, port):
+        results = await asyncio.gather(*[request("127.0.0.1", port, "GET", "/ranking") for _ in range(50)])
+        assert all(status == 200 for status, _ in results)
+        snapshot = server.snapshot
+        assert len(snapshot.responses) == 1
+        await request("127.0.0.1", port, "POST", "/results",
+                      {"player1": "Max", "player2": "Lisa", "score": "6:0, 6:0"})
+        status, body = await request("127.0.0.1", port, "GET", "/ranking")
+        assert server.snapshot is not snapshot
+        assert body["ranking"][0]["player"] in ("Max", "Lisa")
+    _run(scenario)
+
+def test_response_cache_is_bounded():
+    server = TournamentServer(_tournament())
+    ranking = server.read("/ranking", {})
+    for row in range(MAX_CACHED_RESPONSES + 20):
+        server.read("/matrix", {"row": [str(row % 4)], "rows": [str(row + 1)]})
+        assert server.read("/ranking", {}) is ranking
+    assert len(server.snapshot.responses) == MAX_CACHED_RESPONSES
+    # Verdrängte Fenster werden einfach neu berechnet
+    assert server.read("/matrix", {"row": ["0"], "rows": ["1"]}) == server.read("/matrix", {"rows": ["1"]})
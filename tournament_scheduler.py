@@ -1,395 +1,1401 @@
+import bisect
 import itertools
-from collections import defaultdict
+import math
+import random
+import time
+from array import array
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 import re
 from datetime import datetime
 import json
 import csv
+import gzip
+import io
+import os
+import mmap
+import struct
+
+try:
+    import numpy
+except ImportError:  # optional: nur für die vektorisierte Neuberechnung
+    numpy = None
 
 class Result:
-    def __init__(self, success, message):
+    def __init__(self, success, message, details=None):
         self.success = success
         self.message = message
-
-match_results = {}
-current_schedule = []
-match_days = {}
-snapshots = {}
-players = []
-
-def export_results_csv(test_export):
-    try:
-        with open(test_export, "w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["p1", "p2", "result"])  # Kopfzeile
-            for (p1, p2), result in match_results.items():
-                writer.writerow([p1, p2, result])
-        return Result(True, f"Ergebnisse in {test_export} exportiert")
-    except Exception as e:
-        return Result(False, f"Fehler beim Exportieren: {str(e)}")
-
-def load_tournament(filename):
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        players.clear()
-        players.extend(data["players"])
-        match_results.clear()
-        match_days.clear()
-        current_schedule.clear()
-        
-        for match in data["matches"]:
-            if match["result"]:
-                match_results[(match["player1"], match["player2"])] = match["result"]
-            if match["day"] not in match_days:
-                match_days[match["day"]] = {"matches": [], "completed": False}
-            match_days[match["day"]]["matches"].append((match["player1"], match["player2"]))
-        
-        for day in data["days"]:
-            match_days[day["number"]]["completed"] = day["status"] == "completed"
-        
-        current_schedule.extend([day["matches"] for day in match_days.values()])
-        return Result(True, f"Turnier aus {filename} geladen")
-    except Exception as e:
-        return Result(False, f"Fehler beim Laden: {str(e)}")
-
-def save_tournament(filename):
-    try:
-        # Turnierdaten zusammenstellen
-        tournament_data = {
-            "tournament_name": "Tennis Tournament",
-            "created_at": datetime.now().isoformat(),
-            "last_modified": datetime.now().isoformat(),
-            "players": list(players),
-            "matches": [
-                {
-                    "id": i + 1,
-                    "player1": p1,
-                    "player2": p2,
-                    "day": day_num,
-                    "court": day["matches"].index((p1, p2)) + 1,  # Korrektur: day["matches"]
-                    "status": "completed" if get_match_result(p1, p2) else "scheduled",
-                    "result": get_match_result(p1, p2) or "",
-                    "winner": p1 if get_match_result(p1, p2) and get_player_statistics(p1)["wins"] > 0 else p2 if get_match_result(p1, p2) else None
-                }
-                for day_num, day in match_days.items()
-                for i, (p1, p2) in enumerate(day["matches"])  # Korrektur: day["matches"]
-            ],
-            "days": [
-                {"number": day_num, "status": "completed" if day["completed"] else "scheduled", "date": datetime.now().date().isoformat()}
-                for day_num, day in match_days.items()
-            ],
-            "current_standings": [
-                {"player": p, "matches_won": get_player_statistics(p)["wins"], "matches_lost": get_player_statistics(p)["losses"], "points": get_player_statistics(p)["wins"]}
-                for p in players
-            ],
-            "version": "1.0"
-        }
-        
-        # In JSON-Datei speichern
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(tournament_data, f, indent=2)
-        return Result(True, f"Turnier in {filename} gespeichert")
-    except Exception as e:
-        return Result(False, f"Fehler beim Speichern: {str(e)}")
+        self.details = details if details is not None else []
+
+SET_PATTERN = re.compile(r'^\d+:\d+$')
+MAX_SETS = 5
+MAX_SET_GAMES = 7  # mehr Punkte hat nur ein Match-Tiebreak
+PARSE_CACHE_SIZE = 4096
+
+class ParsedScore(namedtuple("ParsedScore", ["sets", "p1_sets", "p2_sets"])):
+    # Einmal geparstes Ergebnis: Tupel der Sätze (spiele_p1, spiele_p2) und Satzbilanz
+    __slots__ = ()
+
+    @property
+    def winner(self):
+        return 1 if self.p1_sets > self.p2_sets else 2
+
+    def reversed(self):
+        return ParsedScore(tuple((b, a) for a, b in self.sets), self.p2_sets, self.p1_sets)
+
+    def games(self):
+        # Spielbilanz (spiele_p1, spiele_p2); ein Match-Tiebreak zählt wie ein Spiel 1:0
+        p1_games = p2_games = 0
+        for a, b in self.sets:
+            if a > MAX_SET_GAMES or b > MAX_SET_GAMES:
+                a, b = int(a > b), int(b > a)
+            p1_games += a
+            p2_games += b
+        return p1_games, p2_games
+
+    def compact(self):
+        return ",".join(f"{a}:{b}" for a, b in self.sets)
+
+    def format(self):
+        return ", ".join(f"{a}:{b}" for a, b in self.sets)
+
+_parse_cache = {}
+
+def parse_score(score):
+    # Gleiche Ergebnis-Strings teilen sich ein ParsedScore-Objekt
+    cached = _parse_cache.get(score)
+    if cached is not None:
+        return cached
+    sets = []
+    p1_sets = 0
+    for s in score.split(","):
+        s = s.strip()
+        if not SET_PATTERN.match(s):
+            raise ValueError("Ungültiges Ergebnisformat! Verwenden Sie z. B. '6:4'.")
+        a, _, b = s.partition(":")
+        a, b = int(a), int(b)
+        if a > b:
+            p1_sets += 1
+        sets.append((a, b))
+    if len(sets) > MAX_SETS:
+        raise ValueError(f"Ein Match hat höchstens {MAX_SETS} Sätze.")
+    parsed = ParsedScore(tuple(sets), p1_sets, len(sets) - p1_sets)
+    if len(_parse_cache) < PARSE_CACHE_SIZE:
+        _parse_cache[score] = parsed
+    return parsed
+
+# Alle gültigen Satzergebnisse aus Sicht beider Spieler: 6:0 bis 6:4, 7:5, 7:6
+VALID_SET_SCORES = frozenset(
+    [(6, b) for b in range(5)] + [(7, 5), (7, 6)] +
+    [(b, 6) for b in range(5)] + [(5, 7), (6, 7)]
+)
+
+class ScoreFormat:
+    # Regelwerk eines Matches; sets_to_win=None erlaubt jede Satzzahl mit eindeutigem Sieger
+    def __init__(self, name, sets_to_win=None, match_tiebreak_to=None):
+        self.name = name
+        self.sets_to_win = sets_to_win
+        self.max_sets = 2 * sets_to_win - 1 if sets_to_win else MAX_SETS
+        self.match_tiebreak_to = match_tiebreak_to
+        self.tiebreak_scores = frozenset()
+        if match_tiebreak_to:
+            wins = [(match_tiebreak_to, b) for b in range(match_tiebreak_to - 1)]
+            self.tiebreak_scores = frozenset(wins + [(b, a) for a, b in wins])
+
+    def is_decider(self, p1_sets, p2_sets):
+        # Entscheidungssatz wird im Match-Tiebreak-Format als Tiebreak gespielt
+        return (self.match_tiebreak_to is not None and self.sets_to_win is not None
+                and p1_sets == p2_sets == self.sets_to_win - 1)
+
+    def set_error(self, a, b, decider=False):
+        # Fehlermeldung für einen Satz oder None, wenn er gültig ist
+        s = f"{a}:{b}"
+        if decider:
+            if (a, b) in self.tiebreak_scores or (max(a, b) > self.match_tiebreak_to and abs(a - b) == 2):
+                return None
+            return (f"Ungültiger Match-Tiebreak {s}: Er geht bis {self.match_tiebreak_to} "
+                    f"mit 2 Punkten Vorsprung.")
+        if (a, b) in VALID_SET_SCORES:
+            return None
+        if a == b:
+            return f"Ungültiger Satz {s}: Ein Satz kann nicht unentschieden enden."
+        if a < 6 and b < 6:
+            return f"Ungültiger Satz {s}: Ein Satz muss bis mindestens 6 gehen."
+        return f"Ungültiger Satz {s}: Ein Satz endet bei 6 mit 2 Vorsprung oder bei 7 mit 5 oder 6."
+
+    def validate(self, parsed):
+        if len(parsed.sets) > self.max_sets:
+            raise ValueError(f"Ein Match hat höchstens {self.max_sets} Sätze.")
+        p1_sets = p2_sets = 0
+        for a, b in parsed.sets:
+            if self.sets_to_win in (p1_sets, p2_sets):
+                raise ValueError("Nach dem entscheidenden Satz darf kein weiterer Satz folgen.")
+            error = self.set_error(a, b, self.is_decider(p1_sets, p2_sets))
+            if error:
+                raise ValueError(error)
+            if a > b:
+                p1_sets += 1
+            else:
+                p2_sets += 1
+        if p1_sets == p2_sets:
+            raise ValueError("Kein eindeutiger Gewinner bestimmbar.")
+        if self.sets_to_win and max(p1_sets, p2_sets) != self.sets_to_win:
+            raise ValueError(f"Der Sieger braucht {self.sets_to_win} Gewinnsätze.")
+        return parsed
+
+SCORE_FORMATS = {
+    "standard": ScoreFormat("standard"),
+    "best_of_3": ScoreFormat("best_of_3", sets_to_win=2),
+    "best_of_5": ScoreFormat("best_of_5", sets_to_win=3),
+    "match_tiebreak": ScoreFormat("match_tiebreak", sets_to_win=2, match_tiebreak_to=10),
+}
+
+STAT_FIELDS = ("wins", "losses", "sets_won", "sets_lost", "games_won", "games_lost", "tiebreaks_won", "tiebreaks_lost")
+
+def _empty_stats():
+    return dict.fromkeys(STAT_FIELDS, 0)
+
+def _pair_id_key(a, b):
+    return (a << 32) | b if a < b else (b << 32) | a
+
+class PlayerRegistry:
+    # Vergibt jedem Spielernamen eine dichte, dauerhafte ID (ids: Name -> ID, names: ID -> Name)
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def intern(self, name):
+        player_id = self.ids.get(name)
+        if player_id is None:
+            player_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return player_id
+
+    def match_key(self, player1, player2):
+        # Reihenfolgeunabhängiger Schlüssel einer Paarung aus beiden Spieler-IDs
+        return _pair_id_key(self.intern(player1), self.intern(player2))
+
+    def find_match_key(self, player1, player2):
+        # Wie match_key, vergibt aber keine neuen IDs (None bei unbekannten Spielern)
+        a = self.ids.get(player1)
+        b = self.ids.get(player2)
+        if a is None or b is None:
+            return None
+        return _pair_id_key(a, b)
+
+class PlayerStatsTable:
+    # Statistiken aller Spieler in einem flachen Array: STAT_FIELDS-Block je Spieler-ID
+    WIDTH = len(STAT_FIELDS)
+
+    def __init__(self):
+        self.values = array("q")
+
+    def _ensure(self, player_id):
+        missing = (player_id + 1) * self.WIDTH - len(self.values)
+        if missing > 0:
+            self.values.frombytes(bytes(missing * self.values.itemsize))
+
+    def get(self, player_id):
+        if player_id is None or player_id * self.WIDTH >= len(self.values):
+            return _empty_stats()
+        base = player_id * self.WIDTH
+        return dict(zip(STAT_FIELDS, self.values[base:base + self.WIDTH]))
+
+    def add(self, p1_id, p2_id, parsed, sign=1):
+        # Beiträge eines Ergebnisses direkt auf beide Spieler buchen
+        self._ensure(max(p1_id, p2_id))
+        p1_games, p2_games = parsed.games()
+        p1_tiebreaks = p2_tiebreaks = 0
+        for p1_score, p2_score in parsed.sets:
+            if p1_score == 7 and p2_score == 6:
+                p1_tiebreaks += 1
+            elif p2_score == 7 and p1_score == 6:
+                p2_tiebreaks += 1
+        p1_won = 1 if parsed.p1_sets > parsed.p2_sets else 0
+        values = self.values
+        for base, deltas in (
+            (p1_id * self.WIDTH, (p1_won, 1 - p1_won, parsed.p1_sets, parsed.p2_sets,
+                                  p1_games, p2_games, p1_tiebreaks, p2_tiebreaks)),
+            (p2_id * self.WIDTH, (1 - p1_won, p1_won, parsed.p2_sets, parsed.p1_sets,
+                                  p2_games, p1_games, p2_tiebreaks, p1_tiebreaks)),
+        ):
+            for offset, delta in enumerate(deltas):
+                values[base + offset] += sign * delta
+
+    def rows(self, player_ids_list):
+        # Statistiken vieler Spieler in einem Durchlauf über das Array
+        values = self.values
+        width = self.WIDTH
+        size = len(values)
+        empty = (0,) * width
+        for player_id in player_ids_list:
+            base = -1 if player_id is None else player_id * width
+            yield values[base:base + width] if 0 <= base < size else empty
+
+    def clear(self):
+        del self.values[:]
+
+class ResultColumns:
+    # Alle Ergebnisse spaltenweise: je Zeile beide Spieler-IDs in gespeicherter
+    # Reihenfolge, die Satzanzahl und MAX_SETS Satzpaare (mit 0 aufgefüllt). Gelöschte
+    # Zeilen werden durch die letzte Zeile ersetzt, damit die Spalten lückenlos bleiben.
+    # scores hält das beim Eintragen geparste Ergebnis jeder Zeile; gleiche Ergebnisse
+    # teilen sich über shared ein Objekt. Die Zuordnung match_key -> Zeile (rows)
+    # entsteht erst beim ersten Nachschlagen einzelner Matches.
+    def __init__(self):
+        self.rows = None
+        self.scores = []
+        self.shared = {}
+        self.player1 = array("i")
+        self.player2 = array("i")
+        self.set_count = array("B")
+        self.games = array("H")
+
+    def __len__(self):
+        return len(self.set_count)
+
+    def match_key(self, row):
+        return _pair_id_key(self.player1[row], self.player2[row])
+
+    def row_of(self, match_key):
+        if self.rows is None:
+            self.rows = {self.match_key(row): row for row in range(len(self))}
+        return self.rows.get(match_key)
+
+    def _packed(self, parsed):
+        packed = [g for s in parsed.sets for g in s]
+        packed.extend([0] * (2 * MAX_SETS - len(packed)))
+        return packed
+
+    def append(self, p1_id, p2_id, parsed):
+        if self.rows is not None:
+            self.rows[_pair_id_key(p1_id, p2_id)] = len(self)
+        self.scores.append(self.shared.setdefault(parsed, parsed))
+        self.player1.append(p1_id)
+        self.player2.append(p2_id)
+        self.set_count.append(len(parsed.sets))
+        self.games.extend(self._packed(parsed))
+
+    def replace(self, row, p1_id, p2_id, parsed):
+        self.scores[row] = self.shared.setdefault(parsed, parsed)
+        self.player1[row] = p1_id
+        self.player2[row] = p2_id
+        self.set_count[row] = len(parsed.sets)
+        self.games[row * 2 * MAX_SETS:(row + 1) * 2 * MAX_SETS] = array("H", self._packed(parsed))
+
+    def remove(self, match_key):
+        self.row_of(match_key)
+        row = self.rows.pop(match_key)
+        last = len(self) - 1
+        if row != last:
+            self.rows[self.match_key(last)] = row
+            self.scores[row] = self.scores[last]
+            self.player1[row] = self.player1[last]
+            self.player2[row] = self.player2[last]
+            self.set_count[row] = self.set_count[last]
+            width = 2 * MAX_SETS
+            self.games[row * width:(row + 1) * width] = self.games[last * width:(last + 1) * width]
+        self.scores.pop()
+        self.player1.pop()
+        self.player2.pop()
+        self.set_count.pop()
+        del self.games[last * 2 * MAX_SETS:]
+
+    def parsed(self, row):
+        # Ergebnis einer Zeile aus Sicht von player1[row]
+        return self.scores[row]
+
+    def clear(self):
+        self.__init__()
+
+class ParsedResults:
+    # Sicht auf die geparsten Ergebnisse eines ResultStore (Schlüssel wie im Store).
+    # Gelesen wird das beim Eintragen geparste Ergebnis aus den Spalten; der
+    # Ergebnis-String wird dafür nicht erneut zerlegt.
+    def __init__(self, store):
+        self.store = store
+
+    def __getitem__(self, key):
+        store = self.store
+        if not dict.__contains__(store, key):
+            raise KeyError(key)
+        ids = store.registry.ids
+        p1_id = ids[key[0]]
+        columns = store.columns
+        row = columns.row_of(_pair_id_key(p1_id, ids[key[1]]))
+        parsed = columns.parsed(row)
+        return parsed if columns.player1[row] == p1_id else parsed.reversed()
+
+    def get(self, key, default=None):
+        return self[key] if dict.__contains__(self.store, key) else default
+
+    def __contains__(self, key):
+        return dict.__contains__(self.store, key)
+
+    def __len__(self):
+        return dict.__len__(self.store)
+
+    def __iter__(self):
+        return iter(dict.keys(self.store))
+
+    def items(self):
+        # Zeilenweise über die Spalten, ohne die Zuordnung match_key -> Zeile aufzubauen
+        store = self.store
+        columns = store.columns
+        names = store.registry.names
+        for p1_id, p2_id, parsed in zip(columns.player1, columns.player2, columns.scores):
+            key = (names[p1_id], names[p2_id])
+            if dict.__contains__(store, key):
+                yield key, parsed
+
+class ResultStore(dict):
+    # dict (spieler1, spieler2) -> Ergebnis-String, der die Spielerstatistiken laufend
+    # mitführt. Jede Änderung aktualisiert nur die beiden beteiligten Spieler. Die
+    # Sätze liegen zusätzlich spaltenweise in columns, aus denen parsed liest.
+    def __init__(self, *args, registry=None, **kwargs):
+        super().__init__()
+        self.registry = registry if registry is not None else PlayerRegistry()
+        self.parsed = ParsedResults(self)
+        self.player_stats = PlayerStatsTable()
+        self.columns = ResultColumns()
+        self.version = 0
+        self.rewrites = 0  # ersetzte oder gelöschte Ergebnisse
+        self.on_append = None  # wird für jedes neue Ergebnis aufgerufen
+        self.update(*args, **kwargs)
+
+    def _apply(self, key, parsed, sign):
+        self.player_stats.add(self.registry.intern(key[0]), self.registry.intern(key[1]), parsed, sign)
+
+    def set_parsed(self, key, score, parsed):
+        replaced = key in self
+        if replaced:
+            self._apply(key, self.parsed[key], -1)
+            self.rewrites += 1
+        self._apply(key, parsed, 1)
+        p1_id, p2_id = self.registry.ids[key[0]], self.registry.ids[key[1]]
+        row = None
+        if replaced or (key[1], key[0]) in self:
+            row = self.columns.row_of(_pair_id_key(p1_id, p2_id))
+        if row is None:
+            self.columns.append(p1_id, p2_id, parsed)
+        else:
+            self.columns.replace(row, p1_id, p2_id, parsed)
+        self.version += 1
+        super().__setitem__(key, score)
+        if not replaced and self.on_append is not None:
+            self.on_append(key, parsed)
+
+    def key_for(self, player1, player2):
+        # Gespeicherter Schlüssel der Paarung (in Eintragungsreihenfolge) oder None
+        key = (player1, player2)
+        if key in self:
+            return key
+        key = (player2, player1)
+        return key if key in self else None
+
+    def __setitem__(self, key, score):
+        self.set_parsed(key, score, parse_score(score))
+
+    def __delitem__(self, key):
+        score = self[key]
+        super().__delitem__(key)
+        self._forget(key, score)
+
+    def _forget(self, key, score):
+        self.version += 1
+        self.rewrites += 1
+        p1_id, p2_id = self.registry.ids[key[0]], self.registry.ids[key[1]]
+        columns = self.columns
+        match_key = _pair_id_key(p1_id, p2_id)
+        row = columns.row_of(match_key)
+        if row is not None and columns.player1[row] == p1_id:
+            self._apply(key, columns.parsed(row), -1)
+            columns.remove(match_key)
+        else:
+            self._apply(key, parse_score(score), -1)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super().pop(key, *default)
+        score = self[key]
+        del self[key]
+        return score
+
+    def popitem(self):
+        key, score = super().popitem()
+        self._forget(key, score)
+        return key, score
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, score in dict(*args, **kwargs).items():
+            self[key] = score
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self.player_stats.clear()
+        self.columns.clear()
+        self.version += 1
+        self.rewrites += 1
+
+    def adopt(self, other):
+        # Übernimmt den Inhalt eines Stores mit derselben Registry, ohne neu zu parsen
+        super().clear()
+        super().update(other)
+        self.player_stats = other.player_stats
+        self.columns = other.columns
+        self.version += 1
+        self.rewrites += 1
+
+class ScheduleStore(dict):
+    # dict Spieltag -> {"matches": [...], "completed": bool} mit Versionszähler,
+    # damit abgeleitete Indizes erkennen, wann sie neu aufgebaut werden müssen.
+    # Änderungen an den Match-Listen selbst müssen mit touch() gemeldet werden.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def touch(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.touch()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.touch()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.touch()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.touch()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.touch()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self.touch()
+
+class MatchEntry:
+    __slots__ = ("pair", "day", "court", "results")
+
+    def __init__(self, pair, day, court, results):
+        self.pair = pair
+        self.day = day
+        self.court = court
+        self.results = results
+
+    @property
+    def result(self):
+        key = self.results.key_for(*self.pair)
+        return self.results[key] if key else None
+
+    @property
+    def status(self):
+        return "completed" if self.results.key_for(*self.pair) else "scheduled"
+
+class MatchIndex:
+    # match_key -> MatchEntry (Tag, Court, Ergebnis, Status) für alle geplanten Matches,
+    # dazu pro Spieler seine Einsätze nach Spieltag sortiert. Als Bitmasken über die
+    # Spieltage (Bit d = Tag d) kommen hinzu: vorhandene und abgeschlossene Tage sowie
+    # je Spieler die Tage, an denen er spielt; load zählt die Matches pro Tag.
+    def __init__(self, match_days, match_results):
+        self.match_days = match_days
+        self.match_results = match_results
+        self.registry = match_results.registry
+        self.entries = {}
+        self.appearances = {}
+        self.occupancy = {}
+        self.load = {}
+        self.player_days = {}
+        self.days = 0
+        self.completed = 0
+        self.version = None
+
+    def refresh(self):
+        match_days = self.match_days
+        if self.version != match_days.version:
+            self.entries = {}
+            self.appearances = defaultdict(list)
+            self.occupancy = {}
+            self.load = {}
+            self.player_days = defaultdict(int)
+            self.days = self.completed = 0
+            for day_num in sorted(match_days):
+                day = match_days[day_num]
+                bit = 1 << day_num
+                for court, pair in enumerate(day["matches"], 1):
+                    entry = MatchEntry(pair, day_num, court, self.match_results)
+                    self.entries[self.registry.match_key(*pair)] = entry
+                    self.appearances[pair[0]].append(entry)
+                    self.appearances[pair[1]].append(entry)
+                    self.player_days[pair[0]] |= bit
+                    self.player_days[pair[1]] |= bit
+                self.occupancy[day_num] = self._day_mask(day["matches"])
+                self.load[day_num] = len(day["matches"])
+                self.days |= bit
+                if day["completed"]:
+                    self.completed |= bit
+            self.version = match_days.version
+        return self
+
+    def last_day(self):
+        return self.refresh().days.bit_length() - 1
+
+    def next_open_day(self):
+        # Frühester vorhandener, noch nicht abgeschlossener Tag oder None
+        open_days = self.refresh().days & ~self.completed
+        return (open_days & -open_days).bit_length() - 1 if open_days else None
+
+    def mark_completed(self, day_num):
+        self.completed |= 1 << day_num
+
+    def pair_mask(self, pair):
+        ids = self.registry.ids
+        return (1 << ids[pair[0]]) | (1 << ids[pair[1]])
+
+    def _day_mask(self, matches):
+        # Bit i ist gesetzt, wenn der Spieler mit der Id i an diesem Tag spielt
+        mask = 0
+        for pair in matches:
+            mask |= self.pair_mask(pair)
+        return mask
+
+    def player_entries(self, player):
+        return self.refresh().appearances.get(player, [])
+
+    def plays_on(self, player, day_num):
+        player_id = self.registry.ids.get(player)
+        if player_id is None:
+            return False
+        return bool(self.refresh().occupancy.get(day_num, 0) >> player_id & 1)
+
+    def resync_days(self, day_nums, players):
+        # Nach dem Umplanen oder Nachtragen nur die betroffenen Tage und Spieler nachführen
+        for day_num in day_nums:
+            day = self.match_days.get(day_num)
+            if day is None:
+                self.occupancy.pop(day_num, None)
+                self.load.pop(day_num, None)
+                self.days &= ~(1 << day_num)
+                self.completed &= ~(1 << day_num)
+                continue
+            for court, pair in enumerate(day["matches"], 1):
+                key = self.registry.match_key(*pair)
+                entry = self.entries.get(key)
+                if entry is None:
+                    # neu eingeplante Paarung
+                    entry = self.entries[key] = MatchEntry(pair, day_num, court, self.match_results)
+                    self._link(entry)
+                elif entry.day != day_num:
+                    self._unlink(entry)
+                    entry.day = day_num
+                    self._link(entry)
+                entry.court = court
+            self.occupancy[day_num] = self._day_mask(day["matches"])
+            self.load[day_num] = len(day["matches"])
+            self.days |= 1 << day_num
+            if day["completed"]:
+                self.completed |= 1 << day_num
+        for player in players:
+            player_id = self.registry.ids[player]
+            mask = self.player_days.get(player, 0)
+            for day_num in day_nums:
+                if self.occupancy.get(day_num, 0) >> player_id & 1:
+                    mask |= 1 << day_num
+                else:
+                    mask &= ~(1 << day_num)
+            self.player_days[player] = mask
+
+    def _link(self, entry):
+        # Einsatz hinter den bisherigen Einsätzen seines Tages einsortieren; verlegte und
+        # neue Matches stehen am Ende ihres Tages, die Reihenfolge nach Court bleibt also
+        for player in entry.pair:
+            entries = self.appearances[player]
+            entries.insert(bisect.bisect_right(entries, entry.day, key=lambda e: e.day), entry)
+
+    def _unlink(self, entry):
+        for player in entry.pair:
+            entries = self.appearances[player]
+            i = bisect.bisect_left(entries, entry.day, key=lambda e: e.day)
+            while entries[i] is not entry:
+                i += 1
+            del entries[i]
+
+    def mark_synced(self):
+        self.version = self.match_days.version
+
+    def get(self, player1, player2):
+        return self.refresh().entries.get(self.registry.find_match_key(player1, player2))
+
+class RankingTimeline:
+    # Tabellenverlauf nach den Regeln von calculate_standings, Ergebnis für Ergebnis
+    # fortgeschrieben. Alle Spieler stehen mit ihrem Sortierschlüssel (-Punkte, -Siege
+    # gegen Punktgleiche, Satz- und Spielquote, Meldereihenfolge) in einer sortierten
+    # Liste; der Platz ist die Position darin. timeline: Spieler -> [Platz vor dem
+    # ersten Match, Platz nach Match 1, ...].
+    def __init__(self, ranked_players):
+        self.order = {p: i for i, p in enumerate(ranked_players)}
+        self.points = dict.fromkeys(ranked_players, 0)
+        self.totals = {p: [0, 0, 0, 0] for p in ranked_players}  # Sätze +/-, Spiele +/-
+        self.ratios = {p: (0.0, 0.0) for p in ranked_players}
+        self.beaten = {p: [] for p in ranked_players}
+        self.beaten_by = {p: [] for p in ranked_players}
+        self.h2h = dict.fromkeys(ranked_players, 0)  # Siege gegen Spieler mit gleicher Punktzahl
+        self.keys = {p: (0, 0, 0.0, 0.0, i) for p, i in self.order.items()}
+        self.sorted_keys = sorted(self.keys.values())
+        self.timeline = {p: [] for p in ranked_players}
+        self.results = 0
+        self.schedule_version = None
+        self.rewrites = None
+
+    def rank_of(self, player):
+        return bisect.bisect_left(self.sorted_keys, self.keys[player]) + 1
+
+    def _update_key(self, player):
+        old = self.keys[player]
+        new = (-self.points[player], -self.h2h[player]) + self.ratios[player] + (self.order[player],)
+        if new != old:
+            del self.sorted_keys[bisect.bisect_left(self.sorted_keys, old)]
+            bisect.insort(self.sorted_keys, new)
+            self.keys[player] = new
+
+    def _promote(self, winner):
+        points = self.points
+        old_points = points[winner]
+        new_points = old_points + 1
+        points[winner] = new_points
+        for other in self.beaten_by[winner]:
+            if points[other] == old_points:
+                self.h2h[other] -= 1
+                self._update_key(other)
+            elif points[other] == new_points:
+                self.h2h[other] += 1
+                self._update_key(other)
+        self.h2h[winner] = sum(1 for other in self.beaten[winner] if points[other] == new_points)
+        self._update_key(winner)
+
+    def add(self, p1, p2, parsed):
+        order = self.order
+        timeline = self.timeline
+        self.results += 1
+        involved = [p for p in (p1, p2) if p in order]
+        for player in involved:
+            if not timeline[player]:
+                timeline[player].append(self.rank_of(player))
+
+        p1_games, p2_games = parsed.games()
+        for player, own in ((p1, (parsed.p1_sets, parsed.p2_sets, p1_games, p2_games)),
+                            (p2, (parsed.p2_sets, parsed.p1_sets, p2_games, p1_games))):
+            if player in order:
+                player_totals = self.totals[player]
+                for i, value in enumerate(own):
+                    player_totals[i] += value
+                sets_won, sets_lost, games_won, games_lost = player_totals
+                self.ratios[player] = (-sets_won / max(1, sets_won + sets_lost),
+                                       -games_won / max(1, games_won + games_lost))
+                self._update_key(player)
+
+        winner, loser = (p1, p2) if parsed.winner == 1 else (p2, p1)
+        if winner in order:
+            if loser in order:
+                self.beaten[winner].append(loser)
+                self.beaten_by[loser].append(winner)
+            self._promote(winner)
+
+        for player in involved:
+            timeline[player].append(self.rank_of(player))
+
+class StandingsCache:
+    # Zwischenspeicher für abgeleitete Tabellen, gültig solange sich der Zustand
+    # (state_version und die Versionen von match_results/match_days) nicht ändert.
+    # current_version liefert diesen Zustand, z. B. Tournament.current_state_version.
+    def __init__(self, current_version):
+        self.current_version = current_version
+        self.version = None
+        self.values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, compute):
+        version = self.current_version()
+        if version != self.version:
+            self.values = {}
+            self.version = version
+        if name in self.values:
+            self.hits += 1
+            return self.values[name]
+        self.misses += 1
+        value = self.values[name] = compute()
+        return value
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "version": self.version}
+
+CSV_HEADER = ["p1", "p2", "result"]
+
+class JsonStreamReader:
+    # Liest ein JSON-Dokument blockweise; Arrays können Element für Element gelesen werden
+    def __init__(self, f, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size=None):
+        if self.eof:
+            return False
+        if self.pos > self.chunk_size:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unerwartetes Dateiende")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"'{char}' erwartet an Position {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # Ein Wert am Pufferende könnte abgeschnitten sein (z. B. Zahlen)
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+    def items(self):
+        # Schlüssel-Wert-Paare eines Objekts; der Wert wird erst beim Abruf gelesen
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+# Binärer Snapshot (Little Endian):
+#   Kopf | Offsets der Namen (u32, names + 1) | Namen (UTF-8) | Matches | Spieltage
+# Ein Match belegt feste 26 Bytes: Spieler-IDs, Tag, Court, Status, Satzanzahl und
+# bis zu 5 Sätze als Bytepaare (aus Sicht von Spieler 1).
+SNAPSHOT_MAGIC = b"TSNP"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sHHIIIIQQQQ")
+SNAPSHOT_MATCH = struct.Struct("<IIIHBB10s")
+SNAPSHOT_DAY = struct.Struct("<IB3x")
+SNAPSHOT_MAX_SETS = 5
+
+def _pack_sets(parsed):
+    if len(parsed.sets) > SNAPSHOT_MAX_SETS or any(g > 255 for s in parsed.sets for g in s):
+        raise ValueError("Ergebnis passt nicht in einen binären Snapshot")
+    return bytes(g for s in parsed.sets for g in s)
+
+class BinarySnapshot:
+    # Schreibgeschützte, per mmap eingeblendete Sicht auf einen Snapshot.
+    # Namen und Matches werden erst beim Zugriff dekodiert.
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.player_count, self.name_count, self.match_count, self.day_count,
+         self.names_offset, self.matches_offset, self.days_offset,
+         self.constraints_offset) = SNAPSHOT_HEADER.unpack_from(self.buffer)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"{filename} ist kein gültiger Snapshot")
+        self._names = {}
+
+    def name(self, player_id):
+        name = self._names.get(player_id)
+        if name is None:
+            start, end = struct.unpack_from("<II", self.buffer, SNAPSHOT_HEADER.size + 4 * player_id)
+            name = self._names[player_id] = str(self.buffer[self.names_offset + start:self.names_offset + end], "utf-8")
+        return name
+
+    @property
+    def players(self):
+        return [self.name(i) for i in range(self.player_count)]
+
+    def match(self, index):
+        if not 0 <= index < self.match_count:
+            raise IndexError(index)
+        p1, p2, day_num, court, status, set_count, packed = SNAPSHOT_MATCH.unpack_from(
+            self.buffer, self.matches_offset + index * SNAPSHOT_MATCH.size)
+        sets = tuple((packed[2 * i], packed[2 * i + 1]) for i in range(set_count))
+        return {"player1": self.name(p1), "player2": self.name(p2), "day": day_num, "court": court,
+                "status": "completed" if status else "scheduled", "sets": sets}
+
+    def matches(self):
+        for i in range(self.match_count):
+            yield self.match(i)
+
+    def days(self):
+        for i in range(self.day_count):
+            day_num, completed = SNAPSHOT_DAY.unpack_from(self.buffer, self.days_offset + i * SNAPSHOT_DAY.size)
+            yield {"number": day_num, "status": "completed" if completed else "scheduled"}
+
+    def constraints(self):
+        # Rahmenbedingungen als JSON am Dateiende; Offset 0 heißt: keine gespeichert
+        if not self.constraints_offset:
+            return None
+        return SchedulingConstraints(**json.loads(str(self.buffer[self.constraints_offset:], "utf-8")))
+
+    def close(self):
+        if not self.buffer.closed:
+            self.buffer.close()
+
+SAVE_CHUNK_SIZE = 1 << 16
+
+def _json_array(name, items, last=False):
+    # Ein Array-Feld zeilenweise: ein Element pro Zeile
+    yield f'  "{name}": [\n'
+    first = True
+    for item in items:
+        yield ("    " if first else ",\n    ") + json.dumps(item)
+        first = False
+    yield ("\n" if not first else "") + "  ]" + ("\n" if last else ",\n")
+
+EXPORT_TABLES = ("results", "schedule", "standings")
+
+def _write_csv_rows(path, rows, compress=False):
+    # Zeilen landen in einem kleinen Puffer, der blockweise geschrieben wird
+    opener = gzip.open if compress else open
+    with opener(path, "wt", encoding="utf-8", newline="") as f:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= SAVE_CHUNK_SIZE:
+                f.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+        f.write(buffer.getvalue())
+
+class ResultJournal:
+    # Append-only-Journal neben dem Snapshot: eine JSON-Zeile pro Änderung.
+    # Jede Zeile wird sofort an das Betriebssystem übergeben (flush), fsync erfolgt
+    # gebündelt alle batch_size Einträge.
+    def __init__(self, snapshot_file, batch_size=32, compact_every=10000, tournament=None):
+        self.tournament = tournament if tournament is not None else default_tournament
+        self.snapshot_file = snapshot_file
+        self.path = snapshot_file + ".journal"
+        self.batch_size = batch_size
+        self.compact_every = compact_every
+        self.entries = 0
+        self.pending = 0
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def append(self, entry):
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        self.entries += 1
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.sync()
+        if self.compact_every and self.entries >= self.compact_every:
+            self.compact()
+
+    def sync(self):
+        if self.pending:
+            os.fsync(self.file.fileno())
+            self.pending = 0
+
+    def compact(self):
+        # Neuen Snapshot atomar ersetzen, danach das Journal leeren
+        tmp_file = self.snapshot_file + ".tmp"
+        result = self.tournament.save_tournament(tmp_file)
+        if not result.success:
+            raise OSError(result.message)
+        with open(tmp_file, "r+", encoding="utf-8") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.snapshot_file)
+        self.file.truncate(0)
+        self.file.seek(0)
+        self.entries = 0
+        self.pending = 0
+
+    def close(self):
+        self.sync()
+        self.file.close()
 
 def generate_round_robin_pairs(players):
     return list(itertools.combinations(players, 2))
 
-def organize_match_days(pairs, players):
-    global match_days
-    match_days.clear()
+def generate_berger_rounds(players):
+    # Kreismethode (Berger-Tabelle): Spieler 0 bleibt fest, alle anderen rotieren.
+    # Bei ungerader Spielerzahl wird ein Freilos (None) ergänzt.
+    rotation = list(players)
+    if len(rotation) % 2:
+        rotation.append(None)
+    n = len(rotation)
+    rounds = []
+    for _ in range(n - 1):
+        round_games = []
+        for i in range(n // 2):
+            p1, p2 = rotation[i], rotation[n - 1 - i]
+            if p1 is not None and p2 is not None:
+                round_games.append((p1, p2))
+        rounds.append(round_games)
+        rotation.insert(1, rotation.pop())
+    return rounds
+
+def _berger_match_days(pairs, players):
+    # Liefert None, wenn die Paarungen kein vollständiges Round-Robin bilden
+    n = len(players)
+    pair_set = set(pairs)
+    if n < 2 or len(pair_set) != n * (n - 1) // 2 or len(set(players)) != n:
+        return None
+    days = []
+    for round_games in generate_berger_rounds(players):
+        day_matches = []
+        for p1, p2 in round_games:
+            if (p1, p2) in pair_set:
+                day_matches.append((p1, p2))
+            elif (p2, p1) in pair_set:
+                day_matches.append((p2, p1))
+            else:
+                return None
+        days.append(day_matches)
+    return days
+
+class SchedulingConstraints:
+    # Rahmenbedingungen der Planung: courts ist eine feste Platzzahl, eine Liste
+    # (Plätze an Tag 1, 2, ...) oder None (unbegrenzt), unavailable bildet Spieler auf gesperrte Spieltage ab.
+    # Ein Match belegt einen Platz für den ganzen Tag, der Court ist seine Position.
+    def __init__(self, courts, unavailable=None, max_matches_per_day=1, max_days=None):
+        # Ohne Plätze und ohne Tagesgrenze fände die Planung nie ein Ende
+        if isinstance(courts, int) and courts <= 0:
+            raise ValueError("Es muss mindestens ein Platz pro Tag verfügbar sein")
+        self.courts = courts
+        self.unavailable = {p: set(days) for p, days in (unavailable or {}).items()}
+        self.max_matches_per_day = max_matches_per_day
+        if courts is not None and not isinstance(courts, int):
+            max_days = len(courts) if max_days is None else min(max_days, len(courts))
+        self.max_days = max_days
+
+    def courts_on(self, day):
+        if self.courts is None:
+            return math.inf
+        if isinstance(self.courts, int):
+            return self.courts
+        return self.courts[day - 1] if 1 <= day <= len(self.courts) else 0
+
+    def as_dict(self):
+        # JSON-taugliche Form für Snapshot und Journal; SchedulingConstraints(**d) stellt sie wieder her
+        return {"courts": self.courts,
+                "unavailable": {p: sorted(days) for p, days in self.unavailable.items()},
+                "max_matches_per_day": self.max_matches_per_day, "max_days": self.max_days}
+
+    def unavailable_mask(self, player):
+        # Bit d ist gesetzt, wenn der Spieler an Spieltag d nicht kann
+        mask = 0
+        for day in self.unavailable.get(player, ()):
+            mask |= 1 << day
+        return mask
+
+def plan_match_days(pairs, players, constraints):
+    # Verteilt die Paarungen auf Spieltage unter den gegebenen Rahmenbedingungen.
+    # Je Spieler eine Bitmaske der Tage, an denen er nicht (mehr) spielen kann, dazu
+    # eine Maske voller Tage: der früheste freie Tag ist das niedrigste freie Bit.
+    # Liefert ({tag: [paarungen]}, [{"pair": ..., "reason": ...}]) ohne Exception.
+    berger = _berger_match_days(pairs, players)
+    ordered = [pair for day in berger for pair in day] if berger else list(pairs)
+    unavailable = {}
+    for pair in ordered:
+        for p in pair:
+            if p not in unavailable:
+                unavailable[p] = constraints.unavailable_mask(p)
+    blocked = dict(unavailable)
+    # Paarungen mit gesperrten Tagen zuerst, sonst bleibt die Reihenfolge erhalten
+    ordered.sort(key=lambda pair: -bin(unavailable[pair[0]] | unavailable[pair[1]]).count("1"))
+
+    limit = constraints.max_matches_per_day
+    counts = defaultdict(int)
+    days = defaultdict(list)
+    full = 0
+    closed = 0  # Tage ohne Plätze
+    horizon = 0
+    unscheduled = []
+    for pair in ordered:
+        p1, p2 = pair
+        day = None
+        while True:
+            free = ~(blocked[p1] | blocked[p2] | full) & ((1 << (horizon + 1)) - 2)
+            if free:
+                day = (free & -free).bit_length() - 1
+                break
+            if constraints.max_days is not None and horizon >= constraints.max_days:
+                break
+            horizon += 1
+            if constraints.courts_on(horizon) <= 0:
+                closed |= 1 << horizon
+                full |= 1 << horizon
+        if day is None:
+            common = ~(unavailable[p1] | unavailable[p2] | closed) & ((1 << (horizon + 1)) - 2)
+            reason = ("Kein gemeinsamer verfügbarer Spieltag" if not common else
+                      "Alle gemeinsamen Spieltage sind voll oder das Tageslimit ist erreicht")
+            unscheduled.append({"pair": pair, "reason": reason})
+            continue
+
+        bit = 1 << day
+        days[day].append(pair)
+        if len(days[day]) >= constraints.courts_on(day):
+            full |= bit
+        for p in pair:
+            counts[p, day] += 1
+            if counts[p, day] >= limit:
+                blocked[p] |= bit
+    return dict(sorted(days.items())), unscheduled
+
+def _greedy_match_days(pairs, players):
     remaining_pairs = list(pairs)
-    day_number = 1
     n = len(players)
     max_matches_per_day = n // 2
+    days = []
 
     while remaining_pairs:
-        current_day = {"matches": [], "completed": False}
+        day_matches = []
         players_used = set()
+        still_open = []
 
-        for pair in remaining_pairs[:]:
+        for pair in remaining_pairs:
             p1, p2 = pair
-            if (len(current_day["matches"]) < max_matches_per_day and
+            if (len(day_matches) < max_matches_per_day and
                 p1 not in players_used and p2 not in players_used):
-                current_day["matches"].append(pair)
+                day_matches.append(pair)
                 players_used.add(p1)
                 players_used.add(p2)
-                remaining_pairs.remove(pair)
+            else:
+                still_open.append(pair)
 
-        if current_day["matches"]:
-            match_days[day_number] = current_day
-            day_number += 1
-        else:
+        if not day_matches:
             raise ValueError("Konnte nicht alle Paarungen verteilen!")
-
-    global current_schedule
-    current_schedule = [day["matches"] for day in match_days.values()]
-    return current_schedule
-
-def create_schedule(pairs, players):
-    return organize_match_days(pairs, players)
-
-def print_schedule(schedule):
-    print("\n=== Spielplan ===")
-    for day_num, day_matches in match_days.items():
-        print(f"\nTag {day_num}{' (Abgeschlossen)' if day_matches['completed'] else ''}:")
-        for i, (player1, player2) in enumerate(day_matches["matches"], 1):
-            result = get_match_result(player1, player2)
-            print(f"  Court {i}: {player1} vs {player2}{' - ' + result if result else ''}")
-
-def check_fairness(schedule, players):
-    matches_per_round = defaultdict(list)
-    for player in players:
-        for round_num, round_games in enumerate(schedule):
-            for player1, player2 in round_games:
-                if player in (player1, player2):
-                    matches_per_round[player].append(round_num)
-    
-    print("\n=== Fairness-Check ===")
-    for player, rounds in matches_per_round.items():
-        print(f"{player} spielt in Runden: {rounds}")
-        if len(rounds) > 1:
-            gaps = [rounds[i+1] - rounds[i] for i in range(len(rounds)-1)]
-            print(f"Pausenzeiten zwischen Spielen (in Runden): {gaps}")
-            avg_gap = sum(gaps) / len(gaps)
-            print(f"Durchschnittliche Pausenzeit: {avg_gap:.2f}")
-
-def add_player(players, max_players):
-    if len(players) >= max_players:
-        return Result(False, f"Maximale Anzahl von {max_players} Spielern erreicht!")
-
-    while True:
-        player_name = input("Geben Sie den Namen des Spielers ein: ").strip()
-        
-        if not re.match(r'^[A-Za-zÄÖÜäöüß]{2,}$', player_name):
-            print("Ungültiger Name! Bitte nur Buchstaben und mindestens 2 Zeichen verwenden.")
-            continue
-
-        if player_name in players:
-            print("Dieser Spieler existiert bereits!")
-            continue
-        
-        players.append(player_name)
-        return Result(True, f"Spieler {player_name} hinzugefügt.")
-
-def validate_tennis_score(score):
-    sets = [s.strip() for s in score.split(",")]
-    
-    for i, s in enumerate(sets):
-        if not re.match(r'^\d+:\d+$', s):
-            raise ValueError("Ungültiges Ergebnisformat! Verwenden Sie z. B. '6:4'.")
-        
-        p1_score, p2_score = map(int, s.split(":"))
-        
-        if p1_score == p2_score:
-            raise ValueError(f"Ungültiger Satz {s}: Ein Satz kann nicht unentschieden enden.")
-
-        if p1_score >= 6 or p2_score >= 6:
-            if (p1_score == 6 and p2_score <= 4) or (p2_score == 6 and p1_score <= 4):
+        days.append(day_matches)
+        remaining_pairs = still_open
+    return days
+
+# Gewichte der Fairness-Kennzahlen pro Spieler (kleiner ist fairer)
+FAIRNESS_WEIGHTS = {"gap_variance": 1.0, "longest_idle": 1.0, "back_to_back": 0.5}
+
+def _player_fairness(rounds):
+    rounds = sorted(rounds)
+    gaps = [b - a for a, b in zip(rounds, rounds[1:])]
+    if not gaps:
+        return {"rounds": rounds, "gaps": gaps, "avg_gap": 0.0, "gap_variance": 0.0,
+                "longest_idle": 0, "back_to_back": 0}
+    avg_gap = sum(gaps) / len(gaps)
+    return {"rounds": rounds, "gaps": gaps, "avg_gap": avg_gap,
+            "gap_variance": sum((g - avg_gap) ** 2 for g in gaps) / len(gaps),
+            "longest_idle": max(gaps) - 1,  # spielfreie Runden in Folge zwischen zwei Matches
+            "back_to_back": gaps.count(1)}
+
+def _fairness_penalty(stats, weights=FAIRNESS_WEIGHTS):
+    return sum(weight * stats[name] for name, weight in weights.items())
+
+def _fairness_summary(rounds_by_player, weights=FAIRNESS_WEIGHTS):
+    per_player = {p: _player_fairness(rounds) for p, rounds in rounds_by_player.items()}
+    stats = list(per_player.values())
+    return {
+        "players": per_player,
+        "gap_variance": sum(s["gap_variance"] for s in stats) / len(stats) if stats else 0.0,
+        "max_idle": max((s["longest_idle"] for s in stats), default=0),
+        "back_to_back": sum(s["back_to_back"] for s in stats),
+        "score": sum(_fairness_penalty(s, weights) for s in stats),
+    }
+
+def _schedule_rounds_by_player(schedule):
+    rounds_by_player = defaultdict(list)
+    for round_num, round_games in enumerate(schedule):
+        for player1, player2 in round_games:
+            rounds_by_player[player1].append(round_num)
+            rounds_by_player[player2].append(round_num)
+    return rounds_by_player
+
+def schedule_fairness(schedule, weights=FAIRNESS_WEIGHTS):
+    # Strukturierte Fairness-Kennzahlen für einen beliebigen Spielplan (Liste von Runden)
+    return _fairness_summary(_schedule_rounds_by_player(schedule), weights)
+
+class _AnnealingState:
+    # Spielplan während der Optimierung: Runden, belegte Spieler je Runde und
+    # laufend mitgeführte Strafpunkte je Spieler. capacity ist die Platzzahl je Runde,
+    # blocked bildet Spieler auf die Runden ab, in denen sie nicht spielen dürfen.
+    def __init__(self, schedule, frozen, capacity, weights, blocked=None):
+        self.rounds = [list(r) for r in schedule]
+        self.busy = [{p for pair in r for p in pair} for r in self.rounds]
+        self.free = [i for i in range(len(self.rounds)) if i not in frozen]
+        self.capacity = capacity
+        self.blocked = blocked or {}
+        self.weights = weights
+        self.where = _schedule_rounds_by_player(self.rounds)
+        self.penalty = {p: _fairness_penalty(_player_fairness(r), weights) for p, r in self.where.items()}
+        self.score = sum(self.penalty.values())
+
+    def _rescore(self, players):
+        for p in players:
+            new = _fairness_penalty(_player_fairness(self.where[p]), self.weights)
+            self.score += new - self.penalty[p]
+            self.penalty[p] = new
+
+    def swap_rounds(self, a, b):
+        rounds_a, rounds_b = self.rounds[a], self.rounds[b]
+        affected = list(dict.fromkeys(p for pair in rounds_a + rounds_b for p in pair))
+        for p in affected:
+            self.where[p] = [b if r == a else a if r == b else r for r in self.where[p]]
+        self.rounds[a], self.rounds[b] = rounds_b, rounds_a
+        self.busy[a], self.busy[b] = self.busy[b], self.busy[a]
+        self._rescore(affected)
+
+    def _relocate(self, players, source, target):
+        for p in players:
+            self.busy[source].discard(p)
+            self.busy[target].add(p)
+            rounds = self.where[p]
+            rounds[rounds.index(source)] = target
+
+    def move_pair(self, a, index, b):
+        # Paarung rounds[a][index] ans Ende von Runde b
+        pair = self.rounds[a].pop(index)
+        self.rounds[b].append(pair)
+        self._relocate(pair, a, b)
+        self._rescore(pair)
+
+    def unmove_pair(self, a, index, b):
+        pair = self.rounds[b].pop()
+        self.rounds[a].insert(index, pair)
+        self._relocate(pair, b, a)
+        self._rescore(pair)
+
+    def exchange_pairs(self, a, i, b, j):
+        # Tauscht rounds[a][i] und rounds[b][j]; zweimal angewendet ist es die Rücknahme
+        first, second = self.rounds[a][i], self.rounds[b][j]
+        self.rounds[a][i], self.rounds[b][j] = second, first
+        # Ein gemeinsamer Spieler bleibt in beiden Runden
+        self._relocate([p for p in first if p not in second], a, b)
+        self._relocate([p for p in second if p not in first], b, a)
+        self._rescore(first + second)
+
+    def _allowed(self, players, round_num):
+        return not any(round_num in self.blocked.get(p, ()) for p in players)
+
+    def can_swap(self, a, b):
+        return (len(self.rounds[a]) <= self.capacity[b] and len(self.rounds[b]) <= self.capacity[a]
+                and self._allowed(self.busy[a], b) and self._allowed(self.busy[b], a))
+
+    def can_move(self, pair, b):
+        return (len(self.rounds[b]) < self.capacity[b]
+                and pair[0] not in self.busy[b] and pair[1] not in self.busy[b]
+                and self._allowed(pair, b))
+
+    def can_exchange(self, a, i, b, j):
+        first, second = self.rounds[a][i], self.rounds[b][j]
+        return (all(p in second or p not in self.busy[b] for p in first)
+                and all(p in first or p not in self.busy[a] for p in second)
+                and self._allowed(first, b) and self._allowed(second, a))
+
+def _anneal_schedule(schedule, frozen, capacity, seed, iterations, time_budget, weights, blocked=None):
+    # Simulated Annealing über Rundentausch, Verschieben und Tauschen einzelner Paarungen.
+    # Bei gleichem Seed und erreichter Iterationszahl ist das Ergebnis reproduzierbar.
+    rng = random.Random(seed)
+    state = _AnnealingState(schedule, frozen, capacity, weights, blocked)
+    best_score, best_rounds = state.score, [list(r) for r in state.rounds]
+    free = state.free
+    if len(free) < 2:
+        return best_score, best_rounds
+    start = time.perf_counter()
+    temperature = 1.0
+    step = 0
+    while iterations is None or step < iterations:
+        if step % 64 == 0:
+            elapsed = time.perf_counter() - start
+            if elapsed >= time_budget:
+                break
+            progress = step / iterations if iterations else elapsed / time_budget
+            temperature = 0.01 ** progress  # von 1 auf 0.01 abkühlen
+        step += 1
+        before = state.score
+        a, b = rng.sample(free, 2)
+        move = rng.random()
+        if move < 0.2:
+            if not state.can_swap(a, b):
                 continue
-            elif ((p1_score == 7 and p2_score in (5, 6)) or 
-                  (p2_score == 7 and p1_score in (5, 6))):
+            state.swap_rounds(a, b)
+            undo = (state.swap_rounds, a, b)
+        elif move < 0.6:
+            if not state.rounds[a] or not state.rounds[b]:
                 continue
-            else:
-                raise ValueError(f"Ungültiger Satz {s}: Ein Satz endet bei 6 mit 2 Vorsprung oder bei 7 mit 5 oder 6.")
+            i = rng.randrange(len(state.rounds[a]))
+            j = rng.randrange(len(state.rounds[b]))
+            if not state.can_exchange(a, i, b, j):
+                continue
+            state.exchange_pairs(a, i, b, j)
+            undo = (state.exchange_pairs, a, i, b, j)
         else:
-            raise ValueError(f"Ungültiger Satz {s}: Ein Satz muss bis mindestens 6 gehen.")
-    
-    player1_wins = sum(1 for s in sets if int(s.split(":")[0]) > int(s.split(":")[1]))
-    player2_wins = len(sets) - player1_wins
-    if player1_wins == player2_wins:
-        raise ValueError("Kein eindeutiger Gewinner bestimmbar.")
-    
-    return True
-
-def record_result(player1, player2, score):
-    key = (player1, player2)
-    if key in match_results or (player2, player1) in match_results:
-        raise ValueError("Ergebnis für dieses Spiel wurde bereits eingetragen")
-
-    valid_pairs = {pair for round in current_schedule for pair in round}
-    if key not in valid_pairs and (player2, player1) not in valid_pairs:
-        raise ValueError("Spiel ist nicht im Spielplan enthalten")
-
-    validate_tennis_score(score)
-    match_results[key] = score
-
-def get_match_result(player1, player2):
-    key = (player1, player2)
-    reverse_key = (player2, player1)
-    if key in match_results:
-        return match_results[key]
-    elif reverse_key in match_results:
-        return match_results[reverse_key]
-    return None
-
-def get_player_matches(player):
-    matches = []
-    for (p1, p2), result in match_results.items():
-        if p1 == player:
-            matches.append({"opponent": p2, "result": result})
-        elif p2 == player:
-            matches.append({"opponent": p1, "result": result})
-    return matches
-
-def get_player_statistics(player):
-    stats = {"wins": 0, "losses": 0, "sets_won": 0, "sets_lost": 0, "games_won": 0, "games_lost": 0, "tiebreaks_won": 0, "tiebreaks_lost": 0}
-    for (p1, p2), result in match_results.items():
-        if p1 == player or p2 == player:
-            sets = [s.strip() for s in result.split(",")]
-            player_wins = 0
-            opponent_wins = 0
-            for s in sets:
-                p1_score, p2_score = map(int, s.split(":"))
-                if p1 == player:
-                    stats["games_won"] += p1_score
-                    stats["games_lost"] += p2_score
-                    if p1_score > p2_score:
-                        stats["sets_won"] += 1
-                        player_wins += 1
-                        if p1_score == 7 and p2_score == 6:
-                            stats["tiebreaks_won"] += 1
-                    else:
-                        stats["sets_lost"] += 1
-                        opponent_wins += 1
-                        if p2_score == 7 and p1_score == 6:
-                            stats["tiebreaks_lost"] += 1
-                elif p2 == player:
-                    stats["games_won"] += p2_score
-                    stats["games_lost"] += p1_score
-                    if p2_score > p1_score:
-                        stats["sets_won"] += 1
-                        player_wins += 1
-                        if p2_score == 7 and p1_score == 6:
-                            stats["tiebreaks_won"] += 1
-                    else:
-                        stats["sets_lost"] += 1
-                        opponent_wins += 1
-                        if p1_score == 7 and p2_score == 6:
-                            stats["tiebreaks_lost"] += 1
-            if player_wins > opponent_wins:
-                stats["wins"] += 1
-            else:
-                stats["losses"] += 1
-    return stats
-
-def input_match_result(schedule):
-    for round_num, round_games in enumerate(schedule):
-        for player1, player2 in round_games:
-            if not get_match_result(player1, player2):
-                print(f"\nErgebnis für {player1} vs {player2} eingeben (z. B. '6:4' pro Satz):")
-                sets = []
-                
-                while True:
-                    set_score = input(f"Satz {len(sets) + 1} (oder 'fertig' zum Beenden): ").strip()
-                    
-                    if set_score.lower() == "fertig":
-                        if len(sets) < 2:
-                            print("Mindestens 2 gewonnene Sätze erforderlich!")
-                            continue
-                        break
-                    
-                    try:
-                        validate_tennis_score(set_score)
-                        sets.append(set_score)
-                        p1_wins = sum(1 for s in sets if int(s.split(":")[0]) > int(s.split(":")[1]))
-                        p2_wins = len(sets) - p1_wins
-                        if p1_wins == 2 or p2_wins == 2:
-                            break
-                    except ValueError as e:
-                        print(f"Fehler: {e}")
-                        continue
-                
-                score = ", ".join(sets)
-                return player1, player2, score
-    
-    print("Alle Ergebnisse sind bereits eingetragen!")
-    return None
-
-def calculate_standings(players):
-    standings = []
-    player_order = {p: i for i, p in enumerate(players)}
-    for player in players:
-        stats = get_player_statistics(player)
-        standings.append({
-            "player": player,
-            "points": stats["wins"],
-            "matches_won": stats["wins"],
-            "matches_lost": stats["losses"],
-            "sets_won": stats["sets_won"],
-            "sets_lost": stats["sets_lost"],
-            "games_won": stats["games_won"],
-            "games_lost": stats["games_lost"]
-        })
-
-    standings.sort(key=lambda x: (x["points"], x["sets_won"], x["games_won"]), reverse=True)
-
-    def get_direct_winner(p1, p2):
-        result = get_match_result(p1, p2)
-        if result:
-            p1_sets = sum(1 for s in result.split(",") if int(s.split(":")[0]) > int(s.split(":")[1]))
-            p2_sets = len(result.split(",")) - p1_sets
-            return p1 if p1_sets > p2_sets else p2
-        return None
-
-    i = 0
-    while i < len(standings):
-        start = i
-        while i < len(standings) - 1 and standings[i]["points"] == standings[i + 1]["points"]:
-            i += 1
-        i += 1
-        if i - start > 1:
-            group = standings[start:i]
-            for j in range(len(group) - 1):
-                for k in range(len(group) - 1 - j):
-                    p1 = group[k]["player"]
-                    p2 = group[k + 1]["player"]
-                    winner = get_direct_winner(p1, p2)
-                    if winner == p2:
-                        group[k], group[k + 1] = group[k + 1], group[k]
-            standings[start:i] = group
-            
-            if all(get_direct_winner(group[j]["player"], group[j + 1]["player"]) is None for j in range(len(group) - 1)):
-                def sort_key(entry):
-                    set_ratio = entry["sets_won"] / max(1, (entry["sets_won"] + entry["sets_lost"]))
-                    game_ratio = entry["games_won"] / max(1, (entry["games_won"] + entry["games_lost"]))
-                    return (entry["points"], set_ratio, game_ratio, -player_order[entry["player"]])
-                standings[start:i] = sorted(standings[start:i], key=sort_key, reverse=True)
-
-    return standings
-
-def get_player_ranking(player):
-    standings = calculate_standings(list(set([p for round in current_schedule for p1, p2 in round for p in (p1, p2)])))
-    for i, entry in enumerate(standings, 1):
-        if entry["player"] == player:
-            return i
-    return 1 if not standings else len(standings)
-
-def get_complete_ranking():
-    players = list(set([p for round in current_schedule for p1, p2 in round for p in (p1, p2)]))
-    return calculate_standings(players)
-
-def create_match_matrix(players):
-    matrix = [["" for _ in range(len(players) + 1)] for _ in range(len(players) + 1)]
-    for i, player in enumerate(players):
-        matrix[i + 1][0] = player
-        matrix[0][i + 1] = player
-    
-    for (p1, p2), result in match_results.items():
-        p1_index = players.index(p1) + 1
-        p2_index = players.index(p2) + 1
-        cleaned_result = "".join(result.split())
-        matrix[p1_index][p2_index] = cleaned_result
-        
-        if cleaned_result:
-            sets = cleaned_result.split(",")
-            reversed_result = ",".join(f"{s.split(':')[1].strip()}:{s.split(':')[0].strip()}" for s in sets)
-            matrix[p2_index][p1_index] = reversed_result
+            if len(state.rounds[a]) < 2:
+                continue
+            i = rng.randrange(len(state.rounds[a]))
+            if not state.can_move(state.rounds[a][i], b):
+                continue
+            state.move_pair(a, i, b)
+            undo = (state.unmove_pair, a, i, b)
+        delta = state.score - before
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            if state.score < best_score - 1e-9:
+                best_score, best_rounds = state.score, [list(r) for r in state.rounds]
         else:
-            matrix[p2_index][p1_index] = ""
-    
-    return matrix
+            undo[0](*undo[1:])
+    return best_score, best_rounds
+
+def optimize_schedule(schedule, time_budget=1.0, seed=0, workers=1, iterations=None,
+                      frozen=(), weights=FAIRNESS_WEIGHTS, capacities=None, blocked=None):
+    # Verbessert die Fairness eines gültigen Spielplans. Jeder Worker rechnet eine eigene
+    # Kette mit Seed seed + i; das beste Ergebnis (bei Gleichstand der kleinste i) gewinnt.
+    # Runden in frozen bleiben unverändert. capacities (Plätze je Runde) und blocked
+    # ({spieler: gesperrte Rundenindizes}) werden eingehalten. Liefert (Runden, Kennzahlen).
+    if capacities is None:
+        capacities = [max((len(r) for r in schedule), default=0)] * len(schedule)
+    frozen = frozenset(frozen)
+    args = [(schedule, frozen, capacities, seed + i, iterations, time_budget, weights, blocked)
+            for i in range(workers)]
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_anneal_schedule, *zip(*args)))
+    else:
+        results = [_anneal_schedule(*args[0])]
+    best_score, best_rounds = min(results, key=lambda result: result[0])
+    return best_rounds, schedule_fairness(best_rounds, weights)
+
+def _recompute_statistics_numpy(columns, size):
+    np = numpy
+    p1 = np.frombuffer(columns.player1, dtype=columns.player1.typecode)
+    p2 = np.frombuffer(columns.player2, dtype=columns.player2.typecode)
+    set_count = np.frombuffer(columns.set_count, dtype=np.uint8).astype(np.int64)
+    games = np.frombuffer(columns.games, dtype=np.uint16).astype(np.int64).reshape(-1, MAX_SETS, 2)
+    a = games[:, :, 0]
+    b = games[:, :, 1]
+    played = np.arange(MAX_SETS) < set_count[:, None]
+    p1_sets = (played & (a > b)).sum(axis=1)
+    p2_sets = set_count - p1_sets
+    p1_tiebreaks = ((a == 7) & (b == 6)).sum(axis=1)
+    p2_tiebreaks = ((a == 6) & (b == 7)).sum(axis=1)
+    # Match-Tiebreaks zählen wie ein Spiel 1:0
+    match_tiebreak = np.maximum(a, b) > MAX_SET_GAMES
+    p1_games = np.where(match_tiebreak, a > b, a).sum(axis=1)
+    p2_games = np.where(match_tiebreak, b > a, b).sum(axis=1)
+    p1_won = (p1_sets > p2_sets).astype(np.int64)
+    p2_won = 1 - p1_won
+    # Spalten in der Reihenfolge von STAT_FIELDS, einmal aus Sicht von Spieler 1 und 2
+    as_player1 = (p1_won, p2_won, p1_sets, p2_sets, p1_games, p2_games, p1_tiebreaks, p2_tiebreaks)
+    as_player2 = (p2_won, p1_won, p2_sets, p1_sets, p2_games, p1_games, p2_tiebreaks, p1_tiebreaks)
+    matrix = np.empty((size, len(STAT_FIELDS)), dtype=np.int64)
+    for field, (first, second) in enumerate(zip(as_player1, as_player2)):
+        matrix[:, field] = (np.bincount(p1, weights=first, minlength=size)
+                            + np.bincount(p2, weights=second, minlength=size)).astype(np.int64)
+    return matrix.tobytes()
+
+MATRIX_PAGE_ROWS = 20
+MATRIX_PAGE_COLS = 8
+
+class SparseMatchMatrix:
+    # Matrix ohne dichtes Raster: belegt sind nur gespielte Paarungen,
+    # Zellen werden bei Bedarf aus den Ergebnissen des Turniers gelesen
+    def __init__(self, players, tournament=None):
+        self.tournament = tournament if tournament is not None else default_tournament
+        self.players = list(players)
+        self.positions = {player: i for i, player in enumerate(self.players)}
+
+    def __len__(self):
+        return len(self.players)
+
+    def cell(self, row, col):
+        parsed = self.tournament.get_parsed_result(self.players[row], self.players[col])
+        return parsed.compact() if parsed is not None else ""
+
+    def items(self):
+        # Nur belegte Zellen als ((zeile, spalte), text)
+        positions = self.positions
+        for (p1, p2), parsed in self.tournament.match_results.parsed.items():
+            i = positions.get(p1)
+            j = positions.get(p2)
+            if i is None or j is None:
+                continue
+            yield (i, j), parsed.compact()
+            yield (j, i), parsed.reversed().compact()
+
+    def window(self, row_start=0, row_count=MATRIX_PAGE_ROWS, col_start=0, col_count=MATRIX_PAGE_COLS):
+        # Dichter Ausschnitt mit Kopfzeile und Namensspalte, wie create_match_matrix
+        rows = range(row_start, min(row_start + row_count, len(self.players)))
+        cols = range(col_start, min(col_start + col_count, len(self.players)))
+        matrix = [[""] + [self.players[j] for j in cols]]
+        for i in rows:
+            matrix.append([self.players[i]] + [self.cell(i, j) for j in cols])
+        return matrix
 
 def make_match_matrix_pretty(matrix):
     # Bestimme die maximale Breite für jede Spalte
@@ -414,133 +1420,1308 @@ def make_match_matrix_pretty(matrix):
     # Kombiniere alles mit der oberen und unteren Rahmenlinie
     return "\n".join([separator] + formatted_rows + [separator])
 
-def get_tournament_progress():
-    total_matches = sum(len(round_games) for round_games in current_schedule)
-    played_matches = len(match_results)
-    progress_percent = (played_matches / total_matches * 100) if total_matches > 0 else 0
-    
-    open_matches = []
-    for round_games in current_schedule:
-        for p1, p2 in round_games:
-            if not get_match_result(p1, p2):
-                open_matches.append(f"{p1} vs {p2}")
-    
-    standings = calculate_standings(list(set(p for round in current_schedule for p1, p2 in round for p in (p1, p2))))
-    leader = standings[0] if standings else {"player": "Keiner", "matches_won": 0, "matches_lost": 0}
-    
-    output = [
-        f"Turnier-Fortschritt: {progress_percent:.0f}% ({played_matches}/{total_matches} Matches gespielt)",
-        "",
-        "Ausstehende Matches:" if open_matches else "Keine ausstehenden Matches",
-        *[f"{i+1}. {match}" for i, match in enumerate(open_matches)],
-        "",
-        f"Aktueller Tabellenführer: {leader['player']} ({leader['matches_won']} Siege, {leader['matches_lost']} Niederlagen)"
-    ]
-    return "\n".join(line for line in output if line)
-
-def create_player_performance(player):
-    matches = get_player_matches(player)
-    history = []
-    set_balances = []
-    rankings = []
-    
-    if not matches:
-        history.append("Keine Matches")
-        rankings.append(f"Start:  #1")
-    else:
-        for i, match in enumerate(matches):
-            result = match["result"]
-            sets = result.split(", ")
-            p1_wins = sum(1 for s in sets if int(s.split(":")[0]) > int(s.split(":")[1]))
-            p2_wins = len(sets) - p1_wins
-            my_wins = p1_wins if match["opponent"] != player else p2_wins
-            opp_wins = p2_wins if match["opponent"] != player else p1_wins
-            history.append("W" if my_wins > opp_wins else "L")
-            set_display = "██ █" if my_wins == 2 and opp_wins == 1 else "██" if my_wins == 2 else "█" if my_wins == 1 else ""
-            set_balances.append(f"Match {i+1}: {set_display}  ({my_wins}-{opp_wins})")
-            rankings.append(f"{'Start' if i == 0 else f'Nach {i}'} : #{get_player_ranking(player)} {'↑' if i == 0 else '-' if i > 0 else ''}")
-    
-    output = [
-        f"Spieler: {player}",
-        f"Match-Verlauf: {' '.join(history)}",
-        "",
-        "Satz-Bilanz:",
-        *set_balances,
-        "",
-        "Ranglistenentwicklung:",
-        *rankings
-    ]
-    return "\n".join(output)
-
-def get_matches_by_day(day_number):
-    return match_days.get(day_number, {"matches": []})["matches"]
-
-def get_player_schedule(player):
-    output = [f"Spielplan für {player}:\n"]
-    completed_matches = []
-    pending_matches = []
-
-    for day_num, day in match_days.items():
-        for p1, p2 in day["matches"]:
-            if p1 == player or p2 == player:
-                opponent = p2 if p1 == player else p1
-                result = get_match_result(p1, p2)
-                line = f"Tag {day_num}: {player} vs. {opponent} (Court {day['matches'].index((p1, p2)) + 1})"
-                if result:
-                    p1_wins = sum(1 for s in result.split(",") if int(s.split(":")[0]) > int(s.split(":")[1]))
-                    p2_wins = len(result.split(",")) - p1_wins
-                    my_wins = p1_wins if p1 == player else p2_wins
-                    outcome = "Gewonnen" if my_wins > p2_wins else "Verloren"
-                    completed_matches.append(f"- {line}: {outcome} ({result})")
+class Tournament:
+    # Ein Turnier mit seinem gesamten Zustand; mehrere Instanzen sind voneinander unabhängig.
+    # Die Listen und Dicts werden nie neu gebunden, Verweise darauf bleiben gültig.
+    def __init__(self, name="Tennis Tournament", registry=None):
+        self.name = name
+        self.registry = registry if registry is not None else PlayerRegistry()
+        self.match_results = ResultStore(registry=self.registry)
+        self.current_schedule = []
+        self.match_days = ScheduleStore()
+        self.match_index = MatchIndex(self.match_days, self.match_results)
+        self.snapshots = {}
+        self.players = []
+        self.journal = None
+        self.score_format = SCORE_FORMATS["standard"]
+        self.state_version = 0
+        self.standings_cache = StandingsCache(self.current_state_version)
+        self.constraints = None
+        self.ranking_timeline = None
+        self.match_results.on_append = self._extend_timeline
+
+    def close(self):
+        self.close_journal()
+        self.close_binary_snapshots()
+
+    def bump_state_version(self):
+        self.state_version += 1
+
+    def current_state_version(self):
+        return (self.state_version, self.match_results.version, self.match_days.version)
+
+    def get_cache_stats(self):
+        return self.standings_cache.stats()
+
+    def export_results_csv(self, test_export):
+        try:
+            with open(test_export, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(CSV_HEADER)  # Kopfzeile
+                for (p1, p2), result in self.match_results.items():
+                    writer.writerow([p1, p2, result])
+            return Result(True, f"Ergebnisse in {test_export} exportiert")
+        except Exception as e:
+            return Result(False, f"Fehler beim Exportieren: {str(e)}")
+
+    def _check_import_rows(self, rows):
+        # Prüft alle Zeilen in einem Durchgang; liefert (gültige Einträge, Fehler je Zeile)
+        entries = []
+        errors = []
+        seen = set()
+        checked = self.validate_scores(row[2].strip() if len(row) == 3 else "" for _, row in rows)
+        for (line_no, row), (parsed, score_error) in zip(rows, checked):
+            if len(row) != 3:
+                errors.append((line_no, "Erwartet werden genau drei Spalten: p1,p2,result"))
+                continue
+            player1, player2, score = (cell.strip() for cell in row)
+            try:
+                if self.match_index.get(player1, player2) is None:
+                    raise ValueError("Spiel ist nicht im Spielplan enthalten")
+                key = self.registry.find_match_key(player1, player2)
+                if key in seen:
+                    raise ValueError("Ergebnis kommt in der Datei mehrfach vor")
+                if self.match_results.key_for(player1, player2):
+                    raise ValueError("Ergebnis für dieses Spiel wurde bereits eingetragen")
+                seen.add(key)
+                if score_error:
+                    raise ValueError(score_error)
+            except ValueError as e:
+                errors.append((line_no, str(e)))
+                continue
+            entries.append(((player1, player2), score, parsed))
+        return entries, errors
+
+    def import_results_csv(self, filename):
+        # Alles-oder-nichts-Import im Format von export_results_csv
+        try:
+            with open(filename, "r", encoding="utf-8", newline="") as f:
+                rows = [(line_no, row) for line_no, row in enumerate(csv.reader(f), start=1) if row]
+        except Exception as e:
+            return Result(False, f"Fehler beim Importieren: {str(e)}")
+
+        if rows and [cell.strip() for cell in rows[0][1]] == CSV_HEADER:
+            rows = rows[1:]
+        entries, errors = self._check_import_rows(rows)
+        if errors:
+            return Result(False, f"Import abgebrochen: {len(errors)} fehlerhafte Zeile(n), nichts übernommen", errors)
+
+        inserted = []
+        try:
+            for key, score, parsed in entries:
+                self.match_results.set_parsed(key, score, parsed)
+                inserted.append(key)
+        except Exception as e:
+            for key in inserted:
+                del self.match_results[key]
+            return Result(False, f"Fehler beim Importieren: {str(e)}")
+
+        self.bump_state_version()
+        for (player1, player2), score, _ in entries:
+            self._journal_append({"op": "result", "player1": player1, "player2": player2, "score": score})
+        return Result(True, f"{len(entries)} Ergebnisse aus {filename} importiert")
+
+    def _staging_tournament(self):
+        # Leeres Zwischen-Turnier mit derselben Namenstabelle: Laden schreibt dorthin,
+        # damit ein Fehler mitten in der Datei den aktuellen Zustand nicht zerstört
+        staged = Tournament(self.name, self.registry)
+        staged.score_format = self.score_format
+        return staged
+
+    def _adopt_state(self, staged):
+        # Übernimmt den geladenen Zustand, ohne die eigenen Container neu zu binden
+        self.players[:] = staged.players
+        self.match_results.adopt(staged.match_results)
+        dict.clear(self.match_days)
+        dict.update(self.match_days, staged.match_days)
+        self.match_days.touch()
+        self.current_schedule[:] = staged.current_schedule
+        self.score_format = staged.score_format
+        # Sperren und Platzzahl gehören zum alten Spielplan
+        self.constraints = staged.constraints
+
+    def _load_players(self, names):
+        for name in names:
+            self.registry.intern(name)
+        self.players.extend(names)
+
+    def _load_match(self, match, parsed=None):
+        pair = (match["player1"], match["player2"])
+        if parsed is not None:
+            self.match_results.set_parsed(pair, match["result"], parsed)
+        elif match["result"]:
+            self.match_results[pair] = match["result"]
+        day = self.match_days.get(match["day"])
+        if day is None:
+            day = {"matches": [], "completed": False}
+            self.match_days[match["day"]] = day
+            self.current_schedule.append(day["matches"])
+        day["matches"].append(pair)
+
+    def _load_day_status(self, day):
+        self.match_days[day["number"]]["completed"] = day["status"] == "completed"
+
+    def load_tournament(self, filename):
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            staged = self._staging_tournament()
+            staged._load_players(data["players"])
+            for match in data["matches"]:
+                staged._load_match(match)
+            for day in data["days"]:
+                staged._load_day_status(day)
+            if "score_format" in data:
+                staged.score_format = SCORE_FORMATS[data["score_format"]]
+            if data.get("constraints"):
+                staged.constraints = SchedulingConstraints(**data["constraints"])
+
+            self._adopt_state(staged)
+            self.bump_state_version()
+            self._journal_state_replaced()
+            return Result(True, f"Turnier aus {filename} geladen")
+        except Exception as e:
+            return Result(False, f"Fehler beim Laden: {str(e)}")
+
+    def load_tournament_streaming(self, filename, chunk_size=1 << 16):
+        # Wie load_tournament, aber die Matches werden einzeln gelesen und sofort übernommen
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                reader = JsonStreamReader(f, chunk_size)
+                staged = self._staging_tournament()
+                pending_days = []
+                for key in reader.items():
+                    if key == "players":
+                        staged._load_players(reader.value())
+                    elif key == "matches":
+                        for match in reader.array():
+                            staged._load_match(match)
+                    elif key == "days":
+                        pending_days.extend(reader.array())
+                    elif key == "score_format":
+                        staged.score_format = SCORE_FORMATS[reader.value()]
+                    elif key == "constraints":
+                        constraints = reader.value()
+                        if constraints:
+                            staged.constraints = SchedulingConstraints(**constraints)
+                    else:
+                        reader.value()
+                for day in pending_days:
+                    staged._load_day_status(day)
+
+            self._adopt_state(staged)
+            self.bump_state_version()
+            self._journal_state_replaced()
+            return Result(True, f"Turnier aus {filename} geladen")
+        except Exception as e:
+            return Result(False, f"Fehler beim Laden: {str(e)}")
+
+    def save_binary_snapshot(self, filename):
+        try:
+            names = list(self.players)
+            ids = {name: i for i, name in enumerate(names)}
+            records = []
+            for day_num, day in self.match_days.items():
+                for court, (p1, p2) in enumerate(day["matches"], 1):
+                    for name in (p1, p2):
+                        if name not in ids:
+                            ids[name] = len(names)
+                            names.append(name)
+                    key = self.match_results.key_for(p1, p2)
+                    if key:
+                        parsed = self.match_results.parsed[key]
+                        if key != (p1, p2):
+                            parsed = parsed.reversed()
+                        records.append(SNAPSHOT_MATCH.pack(ids[p1], ids[p2], day_num, court, 1,
+                                                           len(parsed.sets), _pack_sets(parsed)))
+                    else:
+                        records.append(SNAPSHOT_MATCH.pack(ids[p1], ids[p2], day_num, court, 0, 0, b""))
+
+            encoded = [name.encode("utf-8") for name in names]
+            offsets = [0]
+            for data in encoded:
+                offsets.append(offsets[-1] + len(data))
+            names_offset = SNAPSHOT_HEADER.size + 4 * len(offsets)
+            matches_offset = names_offset + offsets[-1]
+            days_offset = matches_offset + SNAPSHOT_MATCH.size * len(records)
+            constraints = b""
+            constraints_offset = 0
+            if self.constraints is not None:
+                constraints = json.dumps(self.constraints.as_dict()).encode("utf-8")
+                constraints_offset = days_offset + SNAPSHOT_DAY.size * len(self.match_days)
+            header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(self.players), len(names),
+                                          len(records), len(self.match_days), names_offset, matches_offset,
+                                          days_offset, constraints_offset)
+
+            cached = self.snapshots.pop(filename, None)
+            if cached is not None:
+                cached.close()
+            with open(filename, "wb") as f:
+                f.write(header)
+                f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+                f.write(b"".join(encoded))
+                f.write(b"".join(records))
+                f.write(b"".join(SNAPSHOT_DAY.pack(day_num, day["completed"]) for day_num, day in self.match_days.items()))
+                f.write(constraints)
+            return Result(True, f"Snapshot in {filename} gespeichert")
+        except Exception as e:
+            return Result(False, f"Fehler beim Speichern des Snapshots: {str(e)}")
+
+    def open_binary_snapshot(self, filename):
+        # Geöffnete Snapshots werden in snapshots zwischengespeichert
+        snapshot = self.snapshots.get(filename)
+        if snapshot is None or snapshot.buffer.closed:
+            snapshot = self.snapshots[filename] = BinarySnapshot(filename)
+        return snapshot
+
+    def close_binary_snapshots(self):
+        for snapshot in self.snapshots.values():
+            snapshot.close()
+        self.snapshots.clear()
+
+    def load_binary_snapshot(self, filename):
+        try:
+            snapshot = self.open_binary_snapshot(filename)
+            staged = self._staging_tournament()
+            staged._load_players(snapshot.players)
+            for match in snapshot.matches():
+                sets = match["sets"]
+                if sets:
+                    # Sätze liegen bereits binär vor, der String wird nur für die Anzeige erzeugt
+                    p1_sets = sum(1 for a, b in sets if a > b)
+                    parsed = ParsedScore(sets, p1_sets, len(sets) - p1_sets)
+                    match["result"] = parsed.format()
+                    staged._load_match(match, parsed)
                 else:
-                    pending_matches.append(f"- {line}")
-
-    output.append("Abgeschlossene Matches:")
-    output.extend(completed_matches if completed_matches else ["- Keine"])
-    output.append("\nAusstehende Matches:")
-    output.extend(pending_matches if pending_matches else ["- Keine"])
-    return "\n".join(output)
-
-def mark_day_completed(day_number):
-    if day_number in match_days:
-        match_days[day_number]["completed"] = True
-
-def get_next_scheduled_day():
-    for day_num in sorted(match_days.keys()):
-        if not match_days[day_num]["completed"]:
-            return day_num
-    return None
-
-def reschedule_match(player1, player2, new_day):
-    old_day = None
-    match = (player1, player2)
-    reverse_match = (player2, player1)
-
-    for day_num, day in match_days.items():
-        if match in day["matches"] or reverse_match in day["matches"]:
-            old_day = day_num
-            break
+                    match["result"] = ""
+                    staged._load_match(match)
+            for day in snapshot.days():
+                staged._load_day_status(day)
+            staged.constraints = snapshot.constraints()
+            self._adopt_state(staged)
+            self.bump_state_version()
+            self._journal_state_replaced()
+            return Result(True, f"Turnier aus Snapshot {filename} geladen")
+        except Exception as e:
+            return Result(False, f"Fehler beim Laden des Snapshots: {str(e)}")
+
+    def _iter_saved_matches(self):
+        match_id = 0
+        for day_num, day in self.match_days.items():
+            for court, (p1, p2) in enumerate(day["matches"], 1):
+                match_id += 1
+                key = self.match_results.key_for(p1, p2)
+                if key:
+                    # Das Ergebnis wird immer aus Sicht von player1 gespeichert
+                    parsed = self.match_results.parsed[key]
+                    result = self.match_results[key] if key == (p1, p2) else parsed.reversed().format()
+                    yield {"id": match_id, "player1": p1, "player2": p2, "day": day_num, "court": court,
+                           "status": "completed", "result": result,
+                           "winner": key[0] if parsed.winner == 1 else key[1]}
+                else:
+                    yield {"id": match_id, "player1": p1, "player2": p2, "day": day_num, "court": court,
+                           "status": "scheduled", "result": "", "winner": None}
+
+    def _iter_saved_standings(self):
+        for p, stats in self.get_all_player_statistics(self.players).items():
+            yield {"player": p, "matches_won": stats["wins"], "matches_lost": stats["losses"], "points": stats["wins"]}
+
+    def iter_tournament_json(self):
+        # Erzeugt das Turnier-JSON (Format 1.0) stückweise in einem einzigen Durchlauf
+        now = datetime.now()
+        today = now.date().isoformat()
+        yield "{\n"
+        yield f'  "tournament_name": {json.dumps(self.name)},\n'
+        yield f'  "created_at": {json.dumps(now.isoformat())},\n'
+        yield f'  "last_modified": {json.dumps(now.isoformat())},\n'
+        yield f'  "players": {json.dumps(list(self.players))},\n'
+        yield from _json_array("matches", self._iter_saved_matches())
+        yield from _json_array("days", (
+            {"number": day_num, "status": "completed" if day["completed"] else "scheduled", "date": today}
+            for day_num, day in self.match_days.items()))
+        yield from _json_array("current_standings", self._iter_saved_standings())
+        yield f'  "score_format": {json.dumps(self.score_format.name)},\n'
+        constraints = self.constraints.as_dict() if self.constraints is not None else None
+        yield f'  "constraints": {json.dumps(constraints)},\n'
+        yield f'  "version": {json.dumps("1.0")}\n'
+        yield "}\n"
+
+    def save_tournament(self, filename):
+        try:
+            # In JSON-Datei speichern, in Blöcken statt als Gesamtdokument
+            with open(filename, "w", encoding="utf-8") as f:
+                buffer = []
+                size = 0
+                for chunk in self.iter_tournament_json():
+                    buffer.append(chunk)
+                    size += len(chunk)
+                    if size >= SAVE_CHUNK_SIZE:
+                        f.write("".join(buffer))
+                        buffer = []
+                        size = 0
+                if buffer:
+                    f.write("".join(buffer))
+            return Result(True, f"Turnier in {filename} gespeichert")
+        except Exception as e:
+            return Result(False, f"Fehler beim Speichern: {str(e)}")
+
+    def _iter_result_rows(self):
+        yield ["p1", "p2", "result", "winner", "p1_sets", "p2_sets", "p1_games", "p2_games"]
+        for (p1, p2), parsed in self.match_results.parsed.items():
+            yield [p1, p2, self.match_results[(p1, p2)], p1 if parsed.winner == 1 else p2,
+                   parsed.p1_sets, parsed.p2_sets, *parsed.games()]
+
+    def _iter_schedule_rows(self):
+        yield ["id", "day", "court", "player1", "player2", "status", "result", "day_completed"]
+        for match in self._iter_saved_matches():
+            yield [match["id"], match["day"], match["court"], match["player1"], match["player2"],
+                   match["status"], match["result"], int(self.match_days[match["day"]]["completed"])]
+
+    def _iter_standing_rows(self):
+        yield ["rank", "player", "points", "matches_won", "matches_lost",
+               "sets_won", "sets_lost", "games_won", "games_lost"]
+        for rank, entry in enumerate(self._cached_ranking(), 1):
+            yield [rank, entry["player"], entry["points"], entry["matches_won"], entry["matches_lost"],
+                   entry["sets_won"], entry["sets_lost"], entry["games_won"], entry["games_lost"]]
+
+    def export_tournament_csv(self, directory, compress=False, tables=EXPORT_TABLES):
+        # Eine CSV-Datei pro Tabelle (results, schedule, standings), optional gzip-komprimiert
+        try:
+            os.makedirs(directory, exist_ok=True)
+            suffix = ".csv.gz" if compress else ".csv"
+            rows = {"results": self._iter_result_rows, "schedule": self._iter_schedule_rows,
+                    "standings": self._iter_standing_rows}
+            paths = []
+            for name in tables:
+                path = os.path.join(directory, name + suffix)
+                _write_csv_rows(path, rows[name](), compress)
+                paths.append(path)
+            return Result(True, f"{len(paths)} Tabellen nach {directory} exportiert", paths)
+        except Exception as e:
+            return Result(False, f"Fehler beim Exportieren: {str(e)}")
+
+    def _journal_append(self, entry):
+        if self.journal is not None:
+            self.journal.append(entry)
+
+    def _journal_state_replaced(self):
+        # Nach einem kompletten Zustandswechsel passt das Journal nicht mehr zum Snapshot
+        if self.journal is not None:
+            self.journal.compact()
+
+    def _replay_journal_entry(self, entry):
+        # Wiederholtes Einspielen ist unschädlich (z. B. Absturz während der Kompaktierung)
+        op = entry["op"]
+        if op == "result":
+            # Eingetragene Ergebnisse wurden beim Schreiben geprüft und werden wie beim
+            # Laden ohne erneute Formatprüfung übernommen
+            player1, player2 = entry["player1"], entry["player2"]
+            if self.get_match_result(player1, player2) != entry["score"]:
+                if self.match_results.key_for(player1, player2):
+                    raise ValueError("Ergebnis für dieses Spiel wurde bereits eingetragen")
+                if self.match_index.get(player1, player2) is None:
+                    raise ValueError("Spiel ist nicht im Spielplan enthalten")
+                self.match_results[(player1, player2)] = entry["score"]
+                self.bump_state_version()
+        elif op == "score_format":
+            self.score_format = SCORE_FORMATS[entry["name"]]
+        elif op == "move":
+            info = self.get_match_info(entry["player1"], entry["player2"])
+            if info and info["day"] != entry["day"]:
+                self.reschedule_match(entry["player1"], entry["player2"], entry["day"])
+        elif op == "moves":
+            pending = [move for move in entry["moves"]
+                       if (self.get_match_info(move[0], move[1]) or {}).get("day") != move[2]]
+            if pending:
+                self.reschedule_matches(pending)
+        elif op == "add_player":
+            if entry["player"] not in self.players:
+                self.players.append(entry["player"])
+                self._add_matches([((p1, p2), day) for p1, p2, day in entry["matches"]])
+        elif op == "day_completed":
+            self.mark_day_completed(entry["day"])
+        elif op == "block":
+            # Die zugehörigen Verlegungen stehen als eigener "moves"-Eintrag davor
+            if self.constraints is None:
+                self.constraints = SchedulingConstraints(None)
+            unavailable = self.constraints.unavailable
+            unavailable[entry["player"]] = unavailable.get(entry["player"], set()) | set(entry["days"])
+        else:
+            raise ValueError(f"Unbekannter Journal-Eintrag: {op}")
+
+    def _replay_journal(self, path):
+        # Spielt alle vollständigen Zeilen ein und gibt die Länge des gültigen Teils zurück
+        valid_bytes = 0
+        replayed = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # abgebrochener letzter Eintrag
+                self._replay_journal_entry(json.loads(line))
+                valid_bytes += len(line)
+                replayed += 1
+        return valid_bytes, replayed
+
+    def open_journal(self, filename, batch_size=32, compact_every=10000):
+        try:
+            self.close_journal()
+            journal_path = filename + ".journal"
+            if os.path.exists(filename):
+                result = self.load_tournament(filename)
+                if not result.success:
+                    return result
+            replayed = 0
+            if os.path.exists(journal_path):
+                valid_bytes, replayed = self._replay_journal(journal_path)
+                with open(journal_path, "r+b") as f:
+                    f.truncate(valid_bytes)
+            self.journal = ResultJournal(filename, batch_size, compact_every, self)
+            self.journal.entries = replayed
+            if not os.path.exists(filename):
+                self.journal.compact()
+            return Result(True, f"Journal für {filename} geöffnet ({replayed} Einträge wiederhergestellt)")
+        except Exception as e:
+            self.journal = None
+            return Result(False, f"Fehler beim Öffnen des Journals: {str(e)}")
+
+    def compact_journal(self):
+        if self.journal is None:
+            return Result(False, "Kein Journal geöffnet")
+        try:
+            self.journal.compact()
+            return Result(True, f"Journal in {self.journal.snapshot_file} zusammengeführt")
+        except Exception as e:
+            return Result(False, f"Fehler beim Zusammenführen: {str(e)}")
+
+    def close_journal(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def organize_match_days(self, pairs, players, method="auto"):
+        # method: "auto" (Kreismethode, Greedy als Rückfall), "circle" oder "greedy"
+        if method == "greedy":
+            days = _greedy_match_days(pairs, players)
+        else:
+            days = _berger_match_days(pairs, players)
+            if days is None:
+                if method == "circle":
+                    raise ValueError("Kreismethode benötigt ein vollständiges Round-Robin!")
+                days = _greedy_match_days(pairs, players)
+
+        self.match_days.clear()
+        for day_number, day_matches in enumerate(days, 1):
+            self.match_days[day_number] = {"matches": day_matches, "completed": False}
+        self.constraints = None
+
+        # Die Liste selbst bleibt erhalten, damit Verweise darauf gültig bleiben
+        self.current_schedule[:] = [day["matches"] for day in self.match_days.values()]
+        self.bump_state_version()
+        self._journal_state_replaced()
+        return self.current_schedule
+
+    def organize_constrained_match_days(self, pairs, players, courts, unavailable=None,
+                                        max_matches_per_day=1, max_days=None):
+        # Planung mit fester Platzzahl, gesperrten Tagen und Tageslimit je Spieler.
+        # Nicht planbare Paarungen stehen mit Begründung in Result.details.
+        try:
+            constraints = SchedulingConstraints(courts, unavailable, max_matches_per_day, max_days)
+        except ValueError as e:
+            return Result(False, str(e))
+        days, unscheduled = plan_match_days(pairs, players, constraints)
+
+        self.match_days.clear()
+        for day_number, day_matches in days.items():
+            self.match_days[day_number] = {"matches": day_matches, "completed": False}
+        self.current_schedule[:] = [day["matches"] for day in self.match_days.values()]
+        self.constraints = constraints
+        self.bump_state_version()
+        self._journal_state_replaced()
+
+        planned = sum(len(day_matches) for day_matches in days.values())
+        if unscheduled:
+            return Result(False, f"{planned} Paarungen auf {len(days)} Spieltage verteilt, "
+                                 f"{len(unscheduled)} nicht planbar", unscheduled)
+        return Result(True, f"{planned} Paarungen auf {len(days)} Spieltage verteilt")
+
+    def create_schedule(self, pairs, players):
+        return self.organize_match_days(pairs, players)
+
+    def print_schedule(self, schedule):
+        print("\n=== Spielplan ===")
+        for day_num, day_matches in self.match_days.items():
+            print(f"\nTag {day_num}{' (Abgeschlossen)' if day_matches['completed'] else ''}:")
+            for i, (player1, player2) in enumerate(day_matches["matches"], 1):
+                result = self.get_match_result(player1, player2)
+                print(f"  Court {i}: {player1} vs {player2}{' - ' + result if result else ''}")
+
+    def _rounds_per_player(self, schedule, players):
+        matches_per_round = {}
+        if schedule is self.current_schedule:
+            positions = {day_num: i for i, day_num in enumerate(self.match_days)}
+            for player in players:
+                rounds = sorted(positions[entry.day] for entry in self.match_index.player_entries(player))
+                if rounds:
+                    matches_per_round[player] = rounds
+            return matches_per_round
+
+        # Fremder Spielplan: ein einziger Durchlauf statt einer Suche pro Spieler
+        rounds_by_player = _schedule_rounds_by_player(schedule)
+        for player in players:
+            if player in rounds_by_player:
+                matches_per_round[player] = rounds_by_player[player]
+        return matches_per_round
+
+    def check_fairness(self, schedule, players, verbose=True):
+        # Liefert die Kennzahlen aus _fairness_summary; verbose gibt sie wie bisher aus
+        matches_per_round = self._rounds_per_player(schedule, players)
+        metrics = _fairness_summary(matches_per_round)
+        if not verbose:
+            return metrics
+
+        print("\n=== Fairness-Check ===")
+        for player, rounds in matches_per_round.items():
+            print(f"{player} spielt in Runden: {rounds}")
+            if len(rounds) > 1:
+                gaps = [rounds[i+1] - rounds[i] for i in range(len(rounds)-1)]
+                print(f"Pausenzeiten zwischen Spielen (in Runden): {gaps}")
+                avg_gap = sum(gaps) / len(gaps)
+                print(f"Durchschnittliche Pausenzeit: {avg_gap:.2f}")
+        return metrics
+
+    def optimize_match_days(self, time_budget=1.0, seed=0, workers=1, iterations=None):
+        # Verbessert die Fairness des aktuellen Spielplans. Spieltage mit Ergebnissen
+        # oder dem Status abgeschlossen bleiben unverändert; Rahmenbedingungen
+        # (Plätze je Tag, gesperrte Tage) gelten auch für den optimierten Plan.
+        day_numbers = list(self.match_days)
+        rounds = [self.match_days[d]["matches"] for d in day_numbers]
+        frozen = [i for i, d in enumerate(day_numbers)
+                  if self.match_days[d]["completed"] or any(self.match_results.key_for(*pair) for pair in rounds[i])]
+        capacities = blocked = None
+        constraints = self.constraints
+        if constraints:
+            if constraints.max_matches_per_day > 1:
+                return Result(False, "Optimierung mit mehreren Matches pro Spieler und Tag wird nicht unterstützt")
+            capacities = [constraints.courts_on(d) for d in day_numbers]
+            position = {d: i for i, d in enumerate(day_numbers)}
+            blocked = {p: {position[d] for d in days if d in position}
+                       for p, days in constraints.unavailable.items()}
+        before = schedule_fairness(rounds)
+        optimized, metrics = optimize_schedule(rounds, time_budget, seed, workers, iterations, frozen,
+                                               capacities=capacities, blocked=blocked)
+        if metrics["score"] >= before["score"]:
+            return Result(True, "Spielplan ist bereits optimal für die gegebene Rechenzeit", before)
+
+        for day_num, day_matches in zip(day_numbers, optimized):
+            self.match_days[day_num]["matches"][:] = day_matches
+        self.match_days.touch()
+        self.current_schedule[:] = [day["matches"] for day in self.match_days.values()]
+        self.bump_state_version()
+        self._journal_state_replaced()
+        return Result(True, f"Fairness verbessert: {before['score']:.2f} -> {metrics['score']:.2f}", metrics)
+
+    def add_player(self, players, max_players):
+        if len(players) >= max_players:
+            return Result(False, f"Maximale Anzahl von {max_players} Spielern erreicht!")
+
+        while True:
+            player_name = input("Geben Sie den Namen des Spielers ein: ").strip()
+
+            if not re.match(r'^[A-Za-zÄÖÜäöüß]{2,}$', player_name):
+                print("Ungültiger Name! Bitte nur Buchstaben und mindestens 2 Zeichen verwenden.")
+                continue
 
-    if not old_day:
-        raise ValueError("Match nicht gefunden!")
+            if player_name in players:
+                print("Dieser Spieler existiert bereits!")
+                continue
 
-    if get_match_result(player1, player2):
-        raise ValueError("Bereits gespieltes Match kann nicht verschoben werden!")
+            players.append(player_name)
+            self.registry.intern(player_name)
+            return Result(True, f"Spieler {player_name} hinzugefügt.")
+
+    def set_score_format(self, name):
+        if name not in SCORE_FORMATS:
+            return Result(False, f"Unbekanntes Format: {name}")
+        self.score_format = SCORE_FORMATS[name]
+        self._journal_append({"op": "score_format", "name": name})
+        return Result(True, f"Ergebnisformat {name} aktiv")
+
+    def validate_parsed_score(self, parsed, fmt=None):
+        return (fmt or self.score_format).validate(parsed)
+
+    def validate_tennis_score(self, score, fmt=None):
+        self.validate_parsed_score(parse_score(score), fmt)
+        return True
+
+    def check_score(self, score, fmt=None):
+        # Wirft nicht: (ParsedScore, None) bei Erfolg, sonst (None, Fehlermeldung)
+        try:
+            return self.validate_parsed_score(parse_score(score), fmt), None
+        except ValueError as e:
+            return None, str(e)
+
+    def validate_scores(self, scores, fmt=None):
+        # Prüft viele Ergebnisse auf einmal; gleiche Strings werden nur einmal geprüft
+        fmt = fmt or self.score_format
+        checked = {}
+        results = []
+        for score in scores:
+            outcome = checked.get(score)
+            if outcome is None:
+                outcome = checked[score] = self.check_score(score, fmt)
+            results.append(outcome)
+        return results
+
+    def record_result(self, player1, player2, score):
+        key = (player1, player2)
+        if self.match_results.key_for(player1, player2):
+            raise ValueError("Ergebnis für dieses Spiel wurde bereits eingetragen")
+
+        if self.match_index.get(player1, player2) is None:
+            raise ValueError("Spiel ist nicht im Spielplan enthalten")
+
+        parsed = self.validate_parsed_score(parse_score(score))
+        self.match_results.set_parsed(key, score, parsed)
+        self.bump_state_version()
+        self._journal_append({"op": "result", "player1": player1, "player2": player2, "score": score})
+
+    def get_match_result(self, player1, player2):
+        key = self.match_results.key_for(player1, player2)
+        return self.match_results[key] if key else None
+
+    def get_match_info(self, player1, player2):
+        entry = self.match_index.get(player1, player2)
+        if entry is None:
+            return None
+        return {"player1": entry.pair[0], "player2": entry.pair[1], "day": entry.day,
+                "court": entry.court, "result": entry.result, "status": entry.status}
+
+    def get_parsed_result(self, player1, player2):
+        # Geparstes Ergebnis aus Sicht von player1
+        key = self.match_results.key_for(player1, player2)
+        if key is None:
+            return None
+        parsed = self.match_results.parsed[key]
+        return parsed if key[0] == player1 else parsed.reversed()
+
+    def get_player_matches(self, player):
+        matches = []
+        for (p1, p2), result in self.match_results.items():
+            if p1 == player:
+                matches.append({"opponent": p2, "result": result})
+            elif p2 == player:
+                matches.append({"opponent": p1, "result": result})
+        return matches
+
+    def get_player_statistics(self, player):
+        return self.match_results.player_stats.get(self.registry.ids.get(player))
+
+    def get_all_player_statistics(self, players):
+        # Batch-Variante von get_player_statistics: {spieler: statistik} für alle Spieler
+        rows = self.match_results.player_stats.rows([self.registry.ids.get(p) for p in players])
+        return {p: dict(zip(STAT_FIELDS, row)) for p, row in zip(players, rows)}
+
+    def recompute_player_statistics(self, replace=False):
+        # Berechnet alle Statistiken neu aus den Ergebnis-Spalten (mit NumPy vektorisiert,
+        # sonst in einer Python-Schleife). Mit replace=True ersetzt das Ergebnis die
+        # laufend mitgeführten Werte, z. B. für eine nächtliche Kontrolle.
+        columns = self.match_results.columns
+        table = PlayerStatsTable()
+        size = len(self.registry.names)
+        if numpy is not None and len(columns):
+            table.values.frombytes(_recompute_statistics_numpy(columns, size))
+        else:
+            table._ensure(size - 1)
+            for row in range(len(columns)):
+                table.add(columns.player1[row], columns.player2[row], columns.parsed(row))
+        if replace:
+            self.match_results.player_stats = table
+        return {name: table.get(player_id) for name, player_id in self.registry.ids.items()}
+
+    def input_match_result(self, schedule):
+        for round_num, round_games in enumerate(schedule):
+            for player1, player2 in round_games:
+                if not self.get_match_result(player1, player2):
+                    print(f"\nErgebnis für {player1} vs {player2} eingeben (z. B. '6:4' pro Satz):")
+                    fmt = self.score_format
+                    needed = fmt.sets_to_win or 2
+                    sets = []
+                    p1_wins = p2_wins = 0
+
+                    while True:
+                        set_score = input(f"Satz {len(sets) + 1} (oder 'fertig' zum Beenden): ").strip()
+
+                        if set_score.lower() == "fertig":
+                            if len(sets) < 2:
+                                print("Mindestens 2 gewonnene Sätze erforderlich!")
+                                continue
+                            break
 
-    new_day_players = {p for m in get_matches_by_day(new_day) for p in m}
-    if player1 in new_day_players or player2 in new_day_players:
-        raise ValueError("Ein Spieler hat bereits ein Match am neuen Tag!")
+                        try:
+                            parsed = parse_score(set_score)
+                            if len(parsed.sets) != 1:
+                                raise ValueError("Bitte genau einen Satz eingeben.")
+                            a, b = parsed.sets[0]
+                            error = fmt.set_error(a, b, fmt.is_decider(p1_wins, p2_wins))
+                            if error:
+                                raise ValueError(error)
+                        except ValueError as e:
+                            print(f"Fehler: {e}")
+                            continue
+                        # Satzbilanz wird mitgezählt statt alle Sätze neu zu parsen
+                        sets.append(parsed.format())
+                        if a > b:
+                            p1_wins += 1
+                        else:
+                            p2_wins += 1
+                        if max(p1_wins, p2_wins) == needed:
+                            break
 
-    actual_match = match if match in match_days[old_day]["matches"] else reverse_match
-    match_days[old_day]["matches"].remove(actual_match)
-    if not match_days[old_day]["matches"]:
-        del match_days[old_day]
-    if new_day not in match_days:
-        match_days[new_day] = {"matches": [], "completed": False}
-    match_days[new_day]["matches"].append(actual_match)
+                    score = ", ".join(sets)
+                    return player1, player2, score
 
-    global current_schedule
-    current_schedule = [day["matches"] for day in match_days.values()]
+        print("Alle Ergebnisse sind bereits eingetragen!")
+        return None
+
+    def calculate_standings(self, players):
+        standings = []
+        player_order = {p: i for i, p in enumerate(players)}
+        for player, stats in self.get_all_player_statistics(players).items():
+            standings.append({
+                "player": player,
+                "points": stats["wins"],
+                "matches_won": stats["wins"],
+                "matches_lost": stats["losses"],
+                "sets_won": stats["sets_won"],
+                "sets_lost": stats["sets_lost"],
+                "games_won": stats["games_won"],
+                "games_lost": stats["games_lost"]
+            })
+
+        standings.sort(key=lambda x: x["points"], reverse=True)
+
+        i = 0
+        while i < len(standings):
+            start = i
+            while i < len(standings) - 1 and standings[i]["points"] == standings[i + 1]["points"]:
+                i += 1
+            i += 1
+            if i - start > 1:
+                standings[start:i] = self._resolve_tie(standings[start:i], player_order)
+
+        return standings
+
+    def _head_to_head_wins(self, group_players):
+        # Mini-Tabelle: Siege jedes Spielers gegen die anderen Spieler der Gruppe.
+        # Es wird die günstigere Variante gewählt: alle Paare der Gruppe oder alle Ergebnisse.
+        wins = dict.fromkeys(group_players, 0)
+        g = len(group_players)
+        if g * (g - 1) // 2 <= len(self.match_results):
+            for i, p1 in enumerate(group_players):
+                for p2 in group_players[i + 1:]:
+                    key = self.match_results.key_for(p1, p2)
+                    if key:
+                        winner = key[0] if self.match_results.parsed[key].winner == 1 else key[1]
+                        wins[winner] += 1
+        else:
+            for (p1, p2), parsed in self.match_results.parsed.items():
+                if p1 in wins and p2 in wins:
+                    wins[p1 if parsed.winner == 1 else p2] += 1
+        return wins
+
+    def _resolve_tie(self, group, player_order):
+        # Punktgleiche Spieler: direkter Vergleich, dann Satz-, dann Spielquote, dann Meldereihenfolge
+        h2h = self._head_to_head_wins([entry["player"] for entry in group])
+
+        def sort_key(entry):
+            set_ratio = entry["sets_won"] / max(1, (entry["sets_won"] + entry["sets_lost"]))
+            game_ratio = entry["games_won"] / max(1, (entry["games_won"] + entry["games_lost"]))
+            return (-h2h[entry["player"]], -set_ratio, -game_ratio, player_order[entry["player"]])
+
+        return sorted(group, key=sort_key)
+
+    def _ranking_players(self):
+        # Alle Spieler des Spielplans in fester Reihenfolge (erstes Auftreten)
+        return list(dict.fromkeys(p for round in self.current_schedule for p1, p2 in round for p in (p1, p2)))
+
+    def _cached_ranking(self):
+        return self.standings_cache.get("ranking", lambda: self.calculate_standings(self._ranking_players()))
+
+    def _cached_positions(self):
+        return self.standings_cache.get("positions", lambda: {
+            entry["player"]: i for i, entry in enumerate(self._cached_ranking(), 1)})
+
+    def get_player_ranking(self, player):
+        position = self._cached_positions().get(player)
+        if position is not None:
+            return position
+        return 1 if not self._cached_positions() else len(self._cached_positions())
+
+    def get_complete_ranking(self):
+        # Kopie, damit Aufrufer den Zwischenspeicher nicht verändern
+        return [dict(entry) for entry in self._cached_ranking()]
+
+    def build_ranking_timeline(self, ranked_players=None):
+        # Spielt die Ergebnisse in Eintragungsreihenfolge nach und führt die Tabelle
+        # schrittweise fort. Für jeden Spieler: [Platz vor dem ersten Match,
+        # Platz nach Match 1, Platz nach Match 2, ...] nach den Regeln von calculate_standings.
+        if ranked_players is None:
+            return self._current_timeline().timeline
+        timeline = RankingTimeline(ranked_players)
+        for (p1, p2), parsed in self.match_results.parsed.items():
+            timeline.add(p1, p2, parsed)
+        return timeline.timeline
+
+    def _current_timeline(self):
+        # Der Verlauf bleibt erhalten und wird bei jedem neuen Ergebnis fortgeschrieben
+        # (_extend_timeline); neu aufgebaut wird nur nach Änderungen am Spielplan oder
+        # nach ersetzten bzw. gelöschten Ergebnissen
+        timeline = self.ranking_timeline
+        results = self.match_results
+        if (timeline is None or timeline.schedule_version != self.match_days.version
+                or timeline.rewrites != results.rewrites or timeline.results != len(results)):
+            timeline = RankingTimeline(self._ranking_players())
+            for (p1, p2), parsed in results.parsed.items():
+                timeline.add(p1, p2, parsed)
+            timeline.schedule_version = self.match_days.version
+            timeline.rewrites = results.rewrites
+            self.ranking_timeline = timeline
+        return timeline
+
+    def _extend_timeline(self, key, parsed):
+        timeline = self.ranking_timeline
+        if (timeline is not None and timeline.schedule_version == self.match_days.version
+                and timeline.rewrites == self.match_results.rewrites
+                and timeline.results == len(self.match_results) - 1):
+            timeline.add(key[0], key[1], parsed)
+
+    def create_match_matrix(self, players):
+        # Kompatibilitätsmodus: komplette (n+1)x(n+1)-Matrix
+        return SparseMatchMatrix(players, self).window(0, len(players), 0, len(players))
+
+    def render_match_matrix_window(self, players, row_start=0, col_start=0,
+                                   row_count=MATRIX_PAGE_ROWS, col_count=MATRIX_PAGE_COLS):
+        # Formatiert nur den angefragten Block, Spaltenbreiten nur aus diesem Block
+        sparse = players if isinstance(players, SparseMatchMatrix) else SparseMatchMatrix(players, self)
+        return make_match_matrix_pretty(sparse.window(row_start, row_count, col_start, col_count))
+
+    def iter_match_matrix_pages(self, players, row_count=MATRIX_PAGE_ROWS, col_count=MATRIX_PAGE_COLS):
+        # Seitenweise Ausgabe: ((zeile, spalte), text) je Block, zeilenweise von links nach rechts
+        sparse = SparseMatchMatrix(players, self)
+        for row_start in range(0, len(sparse), row_count):
+            for col_start in range(0, len(sparse), col_count):
+                yield (row_start, col_start), self.render_match_matrix_window(
+                    sparse, row_start, col_start, row_count, col_count)
+
+    def get_tournament_progress(self):
+        return self.standings_cache.get("progress", self._tournament_progress)
+
+    def _tournament_progress(self):
+        total_matches = sum(len(round_games) for round_games in self.current_schedule)
+        played_matches = len(self.match_results)
+        progress_percent = (played_matches / total_matches * 100) if total_matches > 0 else 0
+
+        open_matches = []
+        for round_games in self.current_schedule:
+            for p1, p2 in round_games:
+                if not self.get_match_result(p1, p2):
+                    open_matches.append(f"{p1} vs {p2}")
+
+        standings = self._cached_ranking()
+        leader = standings[0] if standings else {"player": "Keiner", "matches_won": 0, "matches_lost": 0}
+
+        output = [
+            f"Turnier-Fortschritt: {progress_percent:.0f}% ({played_matches}/{total_matches} Matches gespielt)",
+            "",
+            "Ausstehende Matches:" if open_matches else "Keine ausstehenden Matches",
+            *[f"{i+1}. {match}" for i, match in enumerate(open_matches)],
+            "",
+            f"Aktueller Tabellenführer: {leader['player']} ({leader['matches_won']} Siege, {leader['matches_lost']} Niederlagen)"
+        ]
+        return "\n".join(line for line in output if line)
+
+    def create_player_performance(self, player):
+        matches = self.get_player_matches(player)
+        history = []
+        set_balances = []
+        rankings = []
+
+        if not matches:
+            history.append("Keine Matches")
+            rankings.append(f"Start:  #1")
+        else:
+            ranks = self._current_timeline().timeline.get(player) or [self.get_player_ranking(player)] * (len(matches) + 1)
+            rankings.append(f"Start  : #{ranks[0]}")
+            for i, match in enumerate(matches):
+                parsed = self.get_parsed_result(player, match["opponent"])
+                my_wins, opp_wins = parsed.p1_sets, parsed.p2_sets
+                history.append("W" if my_wins > opp_wins else "L")
+                set_display = "██ █" if my_wins == 2 and opp_wins == 1 else "██" if my_wins == 2 else "█" if my_wins == 1 else ""
+                set_balances.append(f"Match {i+1}: {set_display}  ({my_wins}-{opp_wins})")
+                before, after = ranks[i], ranks[i + 1]
+                rankings.append(f"Nach {i+1} : #{after} {'↑' if after < before else '↓' if after > before else '-'}")
+
+        output = [
+            f"Spieler: {player}",
+            f"Match-Verlauf: {' '.join(history)}",
+            "",
+            "Satz-Bilanz:",
+            *set_balances,
+            "",
+            "Ranglistenentwicklung:",
+            *rankings
+        ]
+        return "\n".join(output)
+
+    def get_matches_by_day(self, day_number):
+        return self.match_days.get(day_number, {"matches": []})["matches"]
+
+    def get_player_schedule(self, player):
+        output = [f"Spielplan für {player}:\n"]
+        completed_matches = []
+        pending_matches = []
+
+        for entry in self.match_index.player_entries(player):
+            p1, p2 = entry.pair
+            opponent = p2 if p1 == player else p1
+            result = self.get_match_result(p1, p2)
+            line = f"Tag {entry.day}: {player} vs. {opponent} (Court {entry.court})"
+            if result:
+                outcome = "Gewonnen" if self.get_parsed_result(player, opponent).winner == 1 else "Verloren"
+                completed_matches.append(f"- {line}: {outcome} ({result})")
+            else:
+                pending_matches.append(f"- {line}")
+
+        output.append("Abgeschlossene Matches:")
+        output.extend(completed_matches if completed_matches else ["- Keine"])
+        output.append("\nAusstehende Matches:")
+        output.extend(pending_matches if pending_matches else ["- Keine"])
+        return "\n".join(output)
+
+    def mark_day_completed(self, day_number):
+        if day_number in self.match_days:
+            self.match_days[day_number]["completed"] = True
+            self.match_index.mark_completed(day_number)
+            self._journal_append({"op": "day_completed", "day": day_number})
+
+    def get_next_scheduled_day(self):
+        return self.match_index.next_open_day()
+
+    def _check_moves(self, moves):
+        # Prüft alle Verschiebungen gemeinsam gegen die Tagesbelegung nach dem Umplanen:
+        # erst werden alle verschobenen Matches ausgetragen, dann an den neuen Tagen
+        # eingetragen. Liefert (Fehler, Plan) mit Fehler = [(Position, Meldung)].
+        index = self.match_index.refresh()
+        constraints = self.constraints
+        errors, checked, seen = [], [], set()
+        for pos, (player1, player2, new_day) in enumerate(moves, 1):
+            entry = index.get(player1, player2)
+            if not entry:
+                errors.append((pos, "Match nicht gefunden!"))
+            elif entry in seen:
+                errors.append((pos, "Match ist mehrfach in der Liste!"))
+            elif entry.status == "completed":
+                errors.append((pos, "Bereits gespieltes Match kann nicht verschoben werden!"))
+            elif entry.day == new_day:
+                errors.append((pos, f"Match ist bereits an Tag {new_day} angesetzt!"))
+            elif new_day < 1:
+                errors.append((pos, f"Ungültiger Spieltag {new_day}!"))
+            else:
+                blocked = [p for p in entry.pair
+                           if constraints and constraints.unavailable_mask(p) >> new_day & 1]
+                if blocked:
+                    errors.append((pos, f"{blocked[0]} ist an Tag {new_day} nicht verfügbar!"))
+                else:
+                    checked.append((pos, entry, new_day))
+                    seen.add(entry)
+        if errors:
+            return errors, []
+
+        occupancy, load = {}, {}
+        for _, entry, _ in checked:
+            day_num = entry.day
+            occupancy[day_num] = occupancy.get(day_num, index.occupancy[day_num]) & ~index.pair_mask(entry.pair)
+            load[day_num] = load.get(day_num, len(self.match_days[day_num]["matches"])) - 1
+        for pos, entry, new_day in checked:
+            mask = index.pair_mask(entry.pair)
+            busy = occupancy.get(new_day, index.occupancy.get(new_day, 0))
+            if busy & mask:
+                errors.append((pos, "Ein Spieler hat bereits ein Match am neuen Tag!"))
+            occupancy[new_day] = busy | mask
+            if new_day not in load:
+                load[new_day] = len(self.match_days[new_day]["matches"]) if new_day in self.match_days else 0
+            load[new_day] += 1
+            if constraints and load[new_day] > constraints.courts_on(new_day):
+                errors.append((pos, f"An Tag {new_day} ist kein Court mehr frei!"))
+        if errors:
+            return errors, []
+        return [], [(entry, new_day) for _, entry, new_day in checked]
+
+    def _apply_moves(self, plan):
+        # Setzt geprüfte Verschiebungen um; Index und Spielplanliste werden nur
+        # für die betroffenen Tage nachgeführt
+        moving = {entry.pair for entry, _ in plan}
+        old_days = {entry.day for entry, _ in plan}
+        for day_num in old_days:
+            matches = self.match_days[day_num]["matches"]
+            matches[:] = [pair for pair in matches if pair not in moving]
+        days_changed = False
+        for entry, new_day in plan:
+            if new_day not in self.match_days:
+                self.match_days[new_day] = {"matches": [], "completed": False}
+                days_changed = True
+            self.match_days[new_day]["matches"].append(entry.pair)
+        for day_num in old_days:
+            if not self.match_days[day_num]["matches"]:
+                del self.match_days[day_num]
+                days_changed = True
+        self.match_days.touch()
+        self.match_index.resync_days(old_days | {new_day for _, new_day in plan},
+                                     {player for entry, _ in plan for player in entry.pair})
+        self.match_index.mark_synced()
+
+        if days_changed:
+            self.current_schedule[:] = [day["matches"] for day in self.match_days.values()]
+        self.bump_state_version()
+
+    def reschedule_match(self, player1, player2, new_day):
+        errors, plan = self._check_moves([(player1, player2, new_day)])
+        if errors:
+            raise ValueError(errors[0][1])
+        self._apply_moves(plan)
+        self._journal_append({"op": "move", "player1": player1, "player2": player2, "day": new_day})
+
+    def reschedule_matches(self, moves):
+        # Mehrere Verschiebungen (player1, player2, neuer Tag) auf einmal, z. B. nach
+        # einem Regentag: entweder alle oder keine. details enthält [(Position, Meldung)].
+        moves = [(player1, player2, new_day) for player1, player2, new_day in moves]
+        errors, plan = self._check_moves(moves)
+        if errors:
+            return Result(False, f"{len(errors)} ungültige Verschiebung(en), nichts geändert", errors)
+        if plan:
+            self._apply_moves(plan)
+            self._journal_append({"op": "moves", "moves": [list(move) for move in moves]})
+        return Result(True, f"{len(plan)} Matches verschoben")
+
+    def _plan_repair(self, pairs, excluded=()):
+        # Sucht für jede Paarung den frühesten offenen Tag ab dem nächsten Spieltag, an dem
+        # beide Spieler frei und verfügbar sind und ein Court frei ist, sonst neue Tage
+        # hinter dem letzten. Wie in plan_match_days sind Tage Bits einer Maske. Tage,
+        # Spielertage und Belegung kommen aus dem Index; betrachtet werden nur die
+        # betroffenen Spieler und die Tage, die als Ziel in Frage kommen.
+        # Liefert ([(paarung, tag)], [{"pair": ..., "reason": ...}]).
+        index = self.match_index.refresh()
+        constraints = self.constraints
+        released = {}  # Spieler -> Tage, die seine verlegten Matches frei machen
+        leaving = defaultdict(int)  # Tag -> Anzahl der verlegten Matches
+        for pair in pairs:
+            entry = index.get(*pair)
+            if entry is not None:
+                leaving[entry.day] += 1
+                for player in pair:
+                    released[player] = released.get(player, 0) | 1 << entry.day
+        last = max(index.last_day(), 0)
+        start = index.next_open_day()
+        closed = ((1 << (last + 1 if start is None else start)) - 1) | index.completed
+        for day_num in excluded:
+            closed |= 1 << day_num
+        full = 0
+        load = {}
+
+        busy = {}
+        def busy_days(player):
+            if player not in busy:
+                mask = index.player_days.get(player, 0) & ~released.get(player, 0)
+                if constraints:
+                    mask |= constraints.unavailable_mask(player)
+                busy[player] = mask
+            return busy[player]
+
+        placed, unscheduled = [], []
+        horizon = last
+        for pair in pairs:
+            p1, p2 = pair
+            day = None
+            while True:
+                free = ~(busy_days(p1) | busy_days(p2) | closed | full) & ((1 << (horizon + 1)) - 1)
+                if free:
+                    day = (free & -free).bit_length() - 1
+                    if constraints:
+                        if day not in load:
+                            load[day] = index.load.get(day, 0) - leaving[day]
+                        if load[day] >= constraints.courts_on(day):
+                            # Tag erst hier als voll erkannt, dann weitersuchen
+                            full |= 1 << day
+                            day = None
+                            continue
+                    break
+                if constraints and constraints.max_days is not None and horizon >= constraints.max_days:
+                    break
+                horizon += 1
+                if constraints and constraints.courts_on(horizon) <= 0:
+                    closed |= 1 << horizon
+            if day is None:
+                unscheduled.append({"pair": pair, "reason": "Kein freier Spieltag innerhalb der Rahmenbedingungen"})
+                continue
+            placed.append((pair, day))
+            busy[p1] |= 1 << day
+            busy[p2] |= 1 << day
+            if constraints:
+                load[day] += 1
+        return placed, unscheduled
+
+    def _repair_moves(self, pairs, excluded=()):
+        # Verlegt die offenen Paarungen pairs; alle anderen Matches bleiben, wo sie sind
+        placed, unscheduled = self._plan_repair(pairs, excluded)
+        if unscheduled:
+            return Result(False, f"{len(unscheduled)} Matches nicht neu planbar, nichts geändert", unscheduled)
+        result = self.reschedule_matches([(p1, p2, day) for (p1, p2), day in placed])
+        if not result.success:
+            return result
+        return Result(True, f"{len(placed)} Matches neu angesetzt",
+                      [{"pair": pair, "day": day} for pair, day in placed])
+
+    def cancel_match_day(self, day_number):
+        # Ausgefallener Spieltag: nur dessen offene Matches wandern auf andere Tage,
+        # bereits eingetragene Ergebnisse bleiben an ihrem Tag
+        day = self.match_days.get(day_number)
+        if day is None:
+            return Result(False, f"Tag {day_number} existiert nicht")
+        if day["completed"]:
+            return Result(False, f"Tag {day_number} ist bereits abgeschlossen")
+        pairs = [pair for pair in day["matches"] if not self.match_results.key_for(*pair)]
+        return self._repair_moves(pairs, excluded={day_number})
+
+    def block_player_days(self, player, days):
+        # Spieler fällt an days aus: die Sperre wird in constraints vermerkt und nur
+        # seine offenen Matches an diesen Tagen werden verlegt
+        days = set(days)
+        constraints = self.constraints
+        if constraints is None:
+            constraints = SchedulingConstraints(None)
+        pairs = [entry.pair for entry in self.match_index.player_entries(player)
+                 if entry.day in days and entry.status == "scheduled"
+                 and not self.match_days[entry.day]["completed"]]
+        previous = self.constraints, constraints.unavailable.get(player)
+        self.constraints = constraints
+        constraints.unavailable[player] = constraints.unavailable.get(player, set()) | days
+        result = self._repair_moves(pairs)
+        if not result.success:
+            self.constraints = previous[0]
+            if previous[1] is None:
+                constraints.unavailable.pop(player, None)
+            else:
+                constraints.unavailable[player] = previous[1]
+            return result
+        self._journal_append({"op": "block", "player": player, "days": sorted(days)})
+        return result
+
+    def _add_matches(self, placed):
+        # Trägt neue Paarungen an den geplanten Tagen ein, ohne den Index neu aufzubauen
+        self.match_index.refresh()
+        days_changed = False
+        for pair, day in placed:
+            if day not in self.match_days:
+                self.match_days[day] = {"matches": [], "completed": False}
+                days_changed = True
+            self.match_days[day]["matches"].append(pair)
+        self.match_days.touch()
+        self.match_index.resync_days({day for _, day in placed}, {p for pair, _ in placed for p in pair})
+        self.match_index.mark_synced()
+        if days_changed:
+            self.current_schedule[:] = [day["matches"] for day in self.match_days.values()]
+        self.bump_state_version()
+
+    def add_late_entrant(self, player):
+        # Nachmelder: seine Paarungen gegen alle bisherigen Spieler werden in freie
+        # Lücken der offenen Tage bzw. auf neue Tage gelegt
+        if player in self.players:
+            return Result(False, f"{player} ist bereits angemeldet")
+        self.registry.intern(player)
+        pairs = [(opponent, player) for opponent in self.players]
+        placed, unscheduled = self._plan_repair(pairs)
+        if unscheduled:
+            return Result(False, f"{len(unscheduled)} Matches nicht planbar, {player} nicht aufgenommen", unscheduled)
+        self.players.append(player)
+        self._add_matches(placed)
+        self._journal_append({"op": "add_player", "player": player,
+                              "matches": [[p1, p2, day] for (p1, p2), day in placed]})
+        return Result(True, f"{player} aufgenommen, {len(placed)} Matches angesetzt",
+                      [{"pair": pair, "day": day} for pair, day in placed])
+
+# Kompatibilitätsschicht: die bisherigen Modulfunktionen und -variablen gehören zum Standardturnier
+default_tournament = Tournament()
+match_results = default_tournament.match_results
+current_schedule = default_tournament.current_schedule
+match_days = default_tournament.match_days
+match_index = default_tournament.match_index
+snapshots = default_tournament.snapshots
+players = default_tournament.players
+player_ids = default_tournament.registry.ids
+player_names = default_tournament.registry.names
+standings_cache = default_tournament.standings_cache
+
+intern_player = default_tournament.registry.intern
+match_key = default_tournament.registry.match_key
+find_match_key = default_tournament.registry.find_match_key
+
+bump_state_version = default_tournament.bump_state_version
+current_state_version = default_tournament.current_state_version
+get_cache_stats = default_tournament.get_cache_stats
+export_results_csv = default_tournament.export_results_csv
+import_results_csv = default_tournament.import_results_csv
+load_tournament = default_tournament.load_tournament
+load_tournament_streaming = default_tournament.load_tournament_streaming
+save_binary_snapshot = default_tournament.save_binary_snapshot
+open_binary_snapshot = default_tournament.open_binary_snapshot
+close_binary_snapshots = default_tournament.close_binary_snapshots
+load_binary_snapshot = default_tournament.load_binary_snapshot
+iter_tournament_json = default_tournament.iter_tournament_json
+save_tournament = default_tournament.save_tournament
+export_tournament_csv = default_tournament.export_tournament_csv
+open_journal = default_tournament.open_journal
+compact_journal = default_tournament.compact_journal
+close_journal = default_tournament.close_journal
+organize_match_days = default_tournament.organize_match_days
+organize_constrained_match_days = default_tournament.organize_constrained_match_days
+create_schedule = default_tournament.create_schedule
+print_schedule = default_tournament.print_schedule
+check_fairness = default_tournament.check_fairness
+optimize_match_days = default_tournament.optimize_match_days
+add_player = default_tournament.add_player
+set_score_format = default_tournament.set_score_format
+validate_parsed_score = default_tournament.validate_parsed_score
+validate_tennis_score = default_tournament.validate_tennis_score
+check_score = default_tournament.check_score
+validate_scores = default_tournament.validate_scores
+record_result = default_tournament.record_result
+get_match_result = default_tournament.get_match_result
+get_match_info = default_tournament.get_match_info
+get_parsed_result = default_tournament.get_parsed_result
+get_player_matches = default_tournament.get_player_matches
+get_player_statistics = default_tournament.get_player_statistics
+get_all_player_statistics = default_tournament.get_all_player_statistics
+recompute_player_statistics = default_tournament.recompute_player_statistics
+input_match_result = default_tournament.input_match_result
+calculate_standings = default_tournament.calculate_standings
+get_player_ranking = default_tournament.get_player_ranking
+get_complete_ranking = default_tournament.get_complete_ranking
+build_ranking_timeline = default_tournament.build_ranking_timeline
+create_match_matrix = default_tournament.create_match_matrix
+render_match_matrix_window = default_tournament.render_match_matrix_window
+iter_match_matrix_pages = default_tournament.iter_match_matrix_pages
+get_tournament_progress = default_tournament.get_tournament_progress
+create_player_performance = default_tournament.create_player_performance
+get_matches_by_day = default_tournament.get_matches_by_day
+get_player_schedule = default_tournament.get_player_schedule
+mark_day_completed = default_tournament.mark_day_completed
+get_next_scheduled_day = default_tournament.get_next_scheduled_day
+reschedule_match = default_tournament.reschedule_match
+reschedule_matches = default_tournament.reschedule_matches
+cancel_match_day = default_tournament.cancel_match_day
+block_player_days = default_tournament.block_player_days
+add_late_entrant = default_tournament.add_late_entrant
 
 def main():
     players = []
@@ -791,4 +2972,4 @@ def main():
             print(result.message)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
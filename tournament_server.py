@@ -0,0 +1,226 @@
+import asyncio
+import json
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import tournament_scheduler
+from tournament_scheduler import SparseMatchMatrix, make_match_matrix_pretty, MATRIX_PAGE_ROWS, MATRIX_PAGE_COLS
+
+MAX_BODY_SIZE = 1 << 16
+MAX_CACHED_RESPONSES = 256  # je Zustand, z. B. viele verschiedene Matrix-Fenster
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _encode(data):
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+def _int_param(query, name, default, minimum):
+    try:
+        value = int(query.get(name, [default])[0])
+    except ValueError:
+        raise HttpError(400, f"Parameter {name} muss eine Zahl sein")
+    if value < minimum:
+        raise HttpError(400, f"Parameter {name} muss mindestens {minimum} sein")
+    return value
+
+def _field(data, name, kind):
+    # Pflichtfeld aus dem JSON-Body mit erwartetem Typ (bool zählt nicht als Zahl)
+    if name not in data:
+        raise HttpError(400, f"Feld fehlt: {name}")
+    value = data[name]
+    if not isinstance(value, kind) or isinstance(value, bool):
+        raise HttpError(400, f"Feld {name} hat den falschen Typ")
+    return value
+
+class ReadSnapshot:
+    # Fertig kodierte Antworten für genau einen Turnierzustand, an alle Leser verteilt.
+    # Behalten werden die zuletzt genutzten max_size Antworten; ältere werden bei
+    # Bedarf neu berechnet.
+    def __init__(self, version, max_size=MAX_CACHED_RESPONSES):
+        self.version = version
+        self.max_size = max_size
+        self.responses = OrderedDict()
+
+    def get(self, key):
+        body = self.responses.get(key)
+        if body is not None:
+            self.responses.move_to_end(key)
+        return body
+
+    def put(self, key, body):
+        self.responses[key] = body
+        if len(self.responses) > self.max_size:
+            self.responses.popitem(last=False)
+        return body
+
+class TournamentServer:
+    # HTTP/JSON-Schnittstelle zu einem Turnier. Schreibzugriffe laufen nacheinander
+    # (write_lock), Lesezugriffe werden aus dem Snapshot des aktuellen Zustands bedient.
+    def __init__(self, tournament=None):
+        self.tournament = tournament if tournament is not None else tournament_scheduler.default_tournament
+        self.write_lock = asyncio.Lock()
+        self.snapshot = None
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    def _current_snapshot(self):
+        version = self.tournament.current_state_version()
+        if self.snapshot is None or self.snapshot.version != version:
+            self.snapshot = ReadSnapshot(version)
+        return self.snapshot
+
+    def read(self, path, query):
+        # Lesen läuft synchron im Event-Loop und sieht daher nie einen halben Schreibvorgang
+        snapshot = self._current_snapshot()
+        cache_key = (path, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+        body = snapshot.get(cache_key)
+        if body is None:
+            body = snapshot.put(cache_key, _encode(self._read_data(path, query)))
+        return body
+
+    def _read_data(self, path, query):
+        t = self.tournament
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if parts == ["ranking"]:
+            return {"ranking": t.get_complete_ranking()}
+        if parts == ["progress"]:
+            return {"progress": t.get_tournament_progress()}
+        if len(parts) == 3 and parts[0] == "players" and parts[2] == "schedule":
+            player = parts[1]
+            entries = [{"day": e.day, "court": e.court, "player1": e.pair[0], "player2": e.pair[1],
+                        "result": e.result, "status": e.status}
+                       for e in t.match_index.player_entries(player)]
+            return {"player": player, "matches": entries, "text": t.get_player_schedule(player)}
+        if parts == ["matrix"]:
+            row = _int_param(query, "row", 0, 0)
+            col = _int_param(query, "col", 0, 0)
+            rows = _int_param(query, "rows", MATRIX_PAGE_ROWS, 1)
+            cols = _int_param(query, "cols", MATRIX_PAGE_COLS, 1)
+            window = SparseMatchMatrix(t.players, t).window(row, rows, col, cols)
+            return {"players": len(t.players), "row": row, "col": col,
+                    "matrix": window, "text": make_match_matrix_pretty(window)}
+        raise HttpError(404, f"Unbekannter Pfad: {path}")
+
+    async def write(self, path, data):
+        async with self.write_lock:
+            t = self.tournament
+            if path not in ("/results", "/reschedule"):
+                raise HttpError(404, f"Unbekannter Pfad: {path}")
+            player1 = _field(data, "player1", str)
+            player2 = _field(data, "player2", str)
+            try:
+                if path == "/results":
+                    t.record_result(player1, player2, _field(data, "score", str))
+                    return _encode({"ok": True, "result": t.get_match_info(player1, player2)})
+                t.reschedule_match(player1, player2, _field(data, "day", int))
+                return _encode({"ok": True, "match": t.get_match_info(player1, player2)})
+            except ValueError as e:
+                raise HttpError(400, str(e))
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                keep_alive = await self._handle_request(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request_line, reader, writer):
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get("connection", "").lower() != "close"
+
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            url = urlsplit(target)
+            if method == "GET":
+                status, body = 200, self.read(url.path, parse_qs(url.query))
+            elif method == "POST":
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_SIZE:
+                    raise HttpError(413, "Anfrage zu groß")
+                raw = await reader.readexactly(length)
+                try:
+                    data = json.loads(raw or b"{}")
+                except ValueError:
+                    raise HttpError(400, "Ungültiges JSON")
+                if not isinstance(data, dict):
+                    raise HttpError(400, "JSON-Objekt erwartet")
+                status, body = 200, await self.write(url.path, data)
+            else:
+                raise HttpError(405, f"Methode {method} nicht erlaubt")
+        except HttpError as e:
+            status, body = e.status, _encode({"ok": False, "error": str(e)})
+        except ValueError:
+            status, body = 400, _encode({"ok": False, "error": "Ungültige Anfrage"})
+            keep_alive = False
+        except Exception as e:
+            # Unerwartete Fehler dürfen die Verbindung nicht ohne Antwort abbrechen
+            status, body = 500, _encode({"ok": False, "error": f"Interner Fehler: {e}"})
+            keep_alive = False
+
+        writer.write((f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                      "Content-Type: application/json; charset=utf-8\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1") + body)
+        return keep_alive
+
+async def request(host, port, method, path, data=None):
+    # Kleiner Client für Tests und Skripte: liefert (Status, JSON-Antwort)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        body = _encode(data) if data is not None else b""
+        writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n"
+                      f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+        status_line = await reader.readline()
+        status = int(status_line.split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await reader.readexactly(length))
+    finally:
+        writer.close()
+
+async def serve(host="127.0.0.1", port=8080, tournament=None):
+    server = TournamentServer(tournament)
+    port = await server.start(host, port)
+    print(f"Turnier-Server läuft auf http://{host}:{port}")
+    await server.server.serve_forever()
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        print(tournament_scheduler.load_tournament(sys.argv[1]).message)
+    asyncio.run(serve())